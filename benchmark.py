@@ -0,0 +1,235 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from types import SimpleNamespace
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import plotAssist as pa
+from create_sample_df import create_sample_df
+
+SEARCH_QUERIES = ["sig", "signal_1", "flag", "zzz"]
+PLOT_GROUPS = 4
+PLOT_CHANNELS_PER_GROUP = 2
+
+class BenchPlotter(pa.Plotter):
+    # Plotter without its Tk window, so plot, highlight and click handling can be timed headless
+    def __init__(self, data_handler: pa.DataHandler, highlights: list[tuple[str, str, str, str]]):
+        self._init_layout(data_handler, "benchmark")
+        self.highlights = highlights
+
+    def _highlight_rules(self) -> list[tuple[str, str, str, str]]:
+        return self.highlights
+
+def measure(fn, repeat: int, setup=lambda: None) -> dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        fn(state)
+        times.append(time.perf_counter() - start)
+    return {'min': min(times), 'median': float(np.median(times)), 'max': max(times), 'repeat': repeat}
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def bench_csv(df: pd.DataFrame, repeat: int) -> dict[str, dict]:
+    parse_dates = isinstance(df.index, pd.DatetimeIndex)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.csv")
+        results['csv_write'] = measure(lambda _: df.to_csv(path), 1)
+        results['csv_read'] = measure(lambda _: pd.read_csv(path, index_col=0, parse_dates=parse_dates), repeat)
+        results['lazy_open'] = measure(lambda _: pa.LazyDataHandler(path, cache=False), repeat)
+    return results
+
+def bench_groups(data_handler: pa.DataHandler, repeat: int) -> dict[str, dict]:
+    channels = data_handler.available_channels
+    half = channels[: len(channels) // 2]
+    middle = channels[len(channels) // 3: len(channels) // 3 + max(len(channels) // 10, 1)]
+
+    def fresh():
+        data_handler.groups = pa.ChannelGroups()
+
+    def selected():
+        fresh()
+        data_handler.select_channels(channels)
+
+    def combined():
+        selected()
+        data_handler.combine_channels(half)
+
+    operations = {
+        'select_channels': (lambda _: data_handler.select_channels(channels), fresh),
+        'select_channels_grouped': (lambda _: data_handler.select_channels(channels, keep_group=True), fresh),
+        'combine_channels': (lambda _: data_handler.combine_channels(half), selected),
+        'split_channels': (lambda _: data_handler.split_channels(half), combined),
+        'move_up': (lambda _: data_handler.move(middle, "up"), selected),
+        'move_down': (lambda _: data_handler.move(middle, "down"), selected),
+        'remove_channels': (lambda _: data_handler.remove_channels(half), selected),
+    }
+    results = {name: measure(fn, repeat, setup) for name, (fn, setup) in operations.items()}
+    fresh()
+    return results
+
+def bench_search(data_handler: pa.DataHandler, repeat: int) -> dict[str, dict]:
+    def cold():
+        data_handler._search = None
+
+    return {
+        'search_first': measure(lambda _: data_handler.search_channels(SEARCH_QUERIES[0]), repeat, cold),
+        'search': measure(lambda _: [data_handler.search_channels(text) for text in SEARCH_QUERIES], repeat),
+    }
+
+def bench_plot(data_handler: pa.DataHandler, repeat: int, rng: np.random.Generator) -> dict[str, dict]:
+    channels = [name for name in data_handler.available_channels if not name.startswith("flag_")]
+    flags = [name for name in data_handler.available_channels if name.startswith("flag_")]
+    highlights = [(flags[0], "==", "1", "red")] if flags else []
+    groups = [
+        channels[i: i + PLOT_CHANNELS_PER_GROUP]
+        for i in range(0, min(len(channels), PLOT_GROUPS * PLOT_CHANNELS_PER_GROUP), PLOT_CHANNELS_PER_GROUP)
+    ]
+    plotters = []
+
+    def make_plotter() -> BenchPlotter:
+        while plotters:
+            plt.close(plotters.pop()._fig)
+        data_handler.groups = pa.ChannelGroups()
+        for group in groups:
+            data_handler.select_channels(group, keep_group=True)
+        plotter = BenchPlotter(data_handler, highlights)
+        plotters.append(plotter)
+        return plotter
+
+    def laid_out() -> BenchPlotter:
+        plotter = make_plotter()
+        plotter.plot()
+        return plotter
+
+    def plotted() -> BenchPlotter:
+        plotter = laid_out()
+        plotter._fig.canvas.draw()
+        return plotter
+
+    def click(plotter: BenchPlotter):
+        ax = plotter._axes[rng.integers(len(plotter._axes))]
+        line, channel = plotter._channel_lines[ax][0]
+        pos = int(rng.integers(len(data_handler.get_x())))
+        xdata, ydata = data_handler.get_x()[pos], data_handler.get_channel_values(channel)[pos]
+        x, y = ax.transData.transform((xdata, ydata))
+        event = SimpleNamespace(canvas=plotter._fig.canvas, x=x, y=y, inaxes=ax, xdata=xdata, ydata=ydata, button=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            plotter._on_click(event)
+
+    def clicks(plotter: BenchPlotter):
+        for _ in range(10):
+            click(plotter)
+
+    results = {
+        'plot': measure(lambda plotter: plotter.plot(), repeat, make_plotter),
+        'draw': measure(lambda plotter: plotter._fig.canvas.draw(), repeat, laid_out),
+        'highlight_spans': measure(lambda plotter: plotter.highlight_spans(), repeat, plotted),
+        'highlight': measure(lambda plotter: [plotter.highlight(ax) for ax in plotter._axes], repeat, plotted),
+        'click_first': measure(click, repeat, plotted),
+        'click_10': measure(clicks, repeat, plotted),
+    }
+    make_plotter()
+    data_handler.groups = pa.ChannelGroups()
+    plotters.clear()
+    return results
+
+def run_case(rows: int, channels: int, index: str, flags: int, repeat: int, csv: bool, seed: int) -> dict:
+    df = create_sample_df(rows, channels, flags, index=index, seed=seed)
+    rng = np.random.default_rng(seed)
+    results = {}
+    if csv:
+        results.update(bench_csv(df, repeat))
+    results['handler_init'] = measure(lambda _: pa.DataHandler(df), repeat)
+    data_handler = pa.DataHandler(df)
+    df = None
+    results.update(bench_search(data_handler, repeat))
+    results.update(bench_groups(data_handler, repeat))
+    results.update(bench_plot(data_handler, repeat, rng))
+    return {'rows': rows, 'channels': channels, 'flags': flags, 'index': index, 'results': results}
+
+def compare(old_path: str, new_path: str) -> None:
+    # median ratio new/old for every timing present in the last run of both files
+    def last_run(path):
+        with open(path) as f:
+            run = [json.loads(line) for line in f if line.strip()][-1]
+        return {
+            (case['rows'], case['channels'], case['index'], name): timing['median']
+            for case in run['cases'] for name, timing in case['results'].items()
+        }
+
+    old, new = last_run(old_path), last_run(new_path)
+    for key in sorted(old.keys() & new.keys()):
+        rows, channels, index, name = key
+        ratio = new[key] / old[key] if old[key] > 0 else float('inf')
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        print(f"{rows:>11} {channels:>6} {index:>8} {name:<24} {old[key] * 1e3:10.2f} ms {new[key] * 1e3:10.2f} ms {ratio:6.2f}x{flag}")
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Time plotAssist on synthetic logs and append the results as one JSON line.")
+    parser.add_argument("--rows", type=float, nargs="+", default=[1e4, 1e5, 1e6], help="row counts, 1e4 to 1e8")
+    parser.add_argument("--channels", type=int, nargs="+", default=[10, 100, 1000], help="channel counts, 10 to 20000")
+    parser.add_argument("--index", choices=["datetime", "numeric"], nargs="+", default=["datetime", "numeric"])
+    parser.add_argument("--flag-fraction", type=float, default=0.1, help="share of channels that are sparse 0/1 flags")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-cells", type=float, default=1e8, help="skip cases with more rows x channels than this")
+    parser.add_argument("--csv", action=argparse.BooleanOptionalAction, default=True, help="also time CSV read and LazyDataHandler open")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmark_results.jsonl")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare the last runs of two result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    warnings.filterwarnings("ignore", message=".*non-interactive.*")
+    run = {
+        'commit': git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'cases': [],
+    }
+    for index in args.index:
+        for rows in map(int, args.rows):
+            for channels in args.channels:
+                if rows * channels > args.max_cells:
+                    print(f"skip   {rows:>11} rows {channels:>6} channels {index}: over --max-cells", file=sys.stderr)
+                    continue
+                flags = int(channels * args.flag_fraction)
+                start = time.perf_counter()
+                case = run_case(rows, channels, index, flags, args.repeat, args.csv, args.seed)
+                run['cases'].append(case)
+                print(f"done   {rows:>11} rows {channels:>6} channels {index} in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+    with open(args.output, "a") as f:
+        f.write(json.dumps(run) + "\n")
+
+if __name__ == "__main__":
+    main()
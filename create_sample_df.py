@@ -1,37 +1,65 @@
 import pandas as pd
 import numpy as np
 
-n_points = 100000
-time_seconds = np.linspace(0, 100, n_points)
+BASE_CHANNELS = 8
 
-# Create base signals
-df = pd.DataFrame({
-    'linear': range(0, n_points),
-    'sine': np.sin(2 * np.pi * time_seconds / 20), 
-    'cosine': np.cos(2 * np.pi * time_seconds / 20)
-})
+def create_sample_df(n_points: int = 100000, n_channels: int = BASE_CHANNELS, n_flags: int = 0, index: str = "datetime", flag_density: float = 0.001, seed: int = 42) -> pd.DataFrame:
+    # the first 8 channels are the original example signals; extra channels are noisy sines and
+    # n_flags sparse 0/1 channels that are mostly 0 with short runs of 1
+    time_seconds = np.linspace(0, 100, n_points)
 
-np.random.seed(42)
+    # Create base signals
+    df = pd.DataFrame({
+        'linear': range(0, n_points),
+        'sine': np.sin(2 * np.pi * time_seconds / 20),
+        'cosine': np.cos(2 * np.pi * time_seconds / 20)
+    })
 
-df['engine_rpm'] = 2500 + 500 * np.sin(2 * np.pi * time_seconds / 15) + np.random.normal(0, 50, n_points)
+    np.random.seed(seed)
 
-df['oil_pressure'] = 45 + 5 * np.sin(2 * np.pi * time_seconds / 25) + np.random.normal(0, 2, n_points)
+    df['engine_rpm'] = 2500 + 500 * np.sin(2 * np.pi * time_seconds / 15) + np.random.normal(0, 50, n_points)
 
-df['coolant_temp'] = 85 + 10 * (time_seconds / 100) + 3 * np.sin(2 * np.pi * time_seconds / 30) + np.random.normal(0, 1.5, n_points)
+    df['oil_pressure'] = 45 + 5 * np.sin(2 * np.pi * time_seconds / 25) + np.random.normal(0, 2, n_points)
 
-df['fuel_flow'] = 12 + 8 * (df['engine_rpm'] - 2500) / 500 + np.random.normal(0, 0.5, n_points)
+    df['coolant_temp'] = 85 + 10 * (time_seconds / 100) + 3 * np.sin(2 * np.pi * time_seconds / 30) + np.random.normal(0, 1.5, n_points)
 
-df['exhaust_temp'] = 400 + 100 * np.roll(df['fuel_flow'] / 20, 5) + np.random.normal(0, 10, n_points)
+    df['fuel_flow'] = 12 + 8 * (df['engine_rpm'] - 2500) / 500 + np.random.normal(0, 0.5, n_points)
 
-start_time = pd.to_datetime('2025-07-03 00:00:00')
-df['timestamps'] = start_time + pd.to_timedelta(time_seconds, unit='s')
+    df['exhaust_temp'] = 400 + 100 * np.roll(df['fuel_flow'] / 20, 5) + np.random.normal(0, 10, n_points)
 
-df.set_index('timestamps', inplace=True)
+    n_signals = max(n_channels - n_flags, 0)
+    columns = {name: df[name].to_numpy() for name in list(df.columns)[:n_signals]}
 
-df.to_csv('example_dataframe_time.csv')
+    for i in range(BASE_CHANNELS, n_signals):
+        period = np.random.uniform(5, 50)
+        columns[f'signal_{i}'] = np.sin(2 * np.pi * time_seconds / period) + np.random.normal(0, 0.1, n_points)
 
-print("Dataset created successfully!")
-print(f"Shape: {df.shape}")
-print(f"Time range: {df.index[0]} to {df.index[-1]}")
-print("\nFirst few rows:")
-print(df.head())
\ No newline at end of file
+    run_length = 20
+    n_runs = max(int(n_points * flag_density / run_length), 1)
+    for i in range(n_flags):
+        starts = np.random.randint(0, n_points, n_runs)
+        edges = np.zeros(n_points + 1, dtype=np.int32)
+        np.add.at(edges, starts, 1)
+        np.add.at(edges, np.minimum(starts + run_length, n_points), -1)
+        columns[f'flag_{i}'] = (np.cumsum(edges[:-1]) > 0).astype(np.int8)
+
+    if index == "datetime":
+        start_time = pd.to_datetime('2025-07-03 00:00:00')
+        idx = pd.DatetimeIndex(start_time + pd.to_timedelta(time_seconds, unit='s'), name='timestamps')
+    elif index == "numeric":
+        idx = pd.Index(time_seconds, name='seconds')
+    else:
+        raise ValueError("index must be 'datetime' or 'numeric'.")
+
+    return pd.DataFrame(columns, index=idx)
+
+if __name__ == "__main__":
+    df = create_sample_df()
+
+    df.to_csv('example_dataframe_time.csv')
+
+    print("Dataset created successfully!")
+    print(f"Shape: {df.shape}")
+    print(f"Time range: {df.index[0]} to {df.index[-1]}")
+    print("\nFirst few rows:")
+    print(df.head())
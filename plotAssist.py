@@ -1,10 +1,30 @@
+import ast
+import bisect
+import contextlib
+import functools
+import io
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
 import time
+import traceback
+import warnings
+from collections import OrderedDict, deque
 import pandas as pd
 import tkinter as tk
 import tkinter.simpledialog as simpledialog
+import tkinter.filedialog as filedialog
+import tkinter.font as tkfont
 import tkinter.ttk as ttk
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.collections import PathCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.markers import MarkerStyle
+from matplotlib.transforms import IdentityTransform
 import numpy as np
 
 COLORS = {
@@ -17,6 +37,110 @@ COLORS = {
     "yellow": "#FFFF00",
 }
 
+FILTER_MODES = ["==", ">=", "<=", ">", "<", "isin"]
+
+PROFILE_SAMPLES = 4096
+PROFILE_EVENTS = 2**16
+PROFILE_PERCENTILES = (50, 90, 99)
+
+class Profiler:
+    # named timing spans; while disabled, span() hands back one shared no-op context so the
+    # instrumented paths pay a single attribute check. Per-stage samples and the trace event log
+    # are bounded, counts and totals are not.
+    def __init__(self, enabled: bool = False, samples: int = PROFILE_SAMPLES, events: int = PROFILE_EVENTS):
+        self.enabled = enabled
+        self.samples = samples
+        self._null = contextlib.nullcontext()
+        self._durations: dict[str, deque] = {}
+        self._counts: dict[str, int] = {}
+        self._totals: dict[str, int] = {}
+        self._events: deque = deque(maxlen=events)
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name: str):
+        if not self.enabled:
+            return self._null
+        return _ProfileSpan(self, name)
+
+    def timed(self, name: str):
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _ProfileSpan(self, name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, name: str, start_ns: int, end_ns: int) -> None:
+        duration = end_ns - start_ns
+        samples = self._durations.get(name)
+        if samples is None:
+            samples = self._durations.setdefault(name, deque(maxlen=self.samples))
+        samples.append(duration)
+        self._counts[name] = self._counts.get(name, 0) + 1
+        self._totals[name] = self._totals.get(name, 0) + duration
+        self._events.append((name, start_ns, duration, threading.get_ident()))
+
+    def reset(self) -> None:
+        self._durations.clear()
+        self._counts.clear()
+        self._totals.clear()
+        self._events.clear()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        # milliseconds; percentiles and max cover the most recent `samples` spans of each stage
+        stats = {}
+        for name, samples in list(self._durations.items()):
+            values = np.fromiter(samples, dtype=np.int64, count=len(samples)) / 1e6
+            stats[name] = {
+                'count': self._counts[name],
+                'total': self._totals[name] / 1e6,
+                'mean': self._totals[name] / 1e6 / self._counts[name],
+                **{f'p{q}': float(v) for q, v in zip(PROFILE_PERCENTILES, np.percentile(values, PROFILE_PERCENTILES))},
+                'max': float(values.max()),
+            }
+        return stats
+
+    def report(self) -> str:
+        header = f"{'stage':<24}{'count':>8}{'total ms':>12}{'mean':>10}" + "".join(f"{f'p{q}':>10}" for q in PROFILE_PERCENTILES) + f"{'max':>10}"
+        rows = [header]
+        for name, stat in sorted(self.stats().items(), key=lambda item: -item[1]['total']):
+            rows.append(
+                f"{name:<24}{stat['count']:>8}{stat['total']:>12.1f}{stat['mean']:>10.2f}"
+                + "".join(f"{stat[f'p{q}']:>10.2f}" for q in PROFILE_PERCENTILES)
+                + f"{stat['max']:>10.2f}"
+            )
+        return "\n".join(rows)
+
+    def dump_chrome_trace(self, path: str) -> None:
+        # complete ("X") events in microseconds, viewable in chrome://tracing or Perfetto
+        pid = os.getpid()
+        events = [
+            {'name': name, 'cat': name.split(".")[0], 'ph': 'X', 'ts': (start - self._origin) / 1e3, 'dur': duration / 1e3, 'pid': pid, 'tid': tid}
+            for name, start, duration, tid in list(self._events)
+        ]
+        with open(path, "w") as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+class _ProfileSpan:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: Profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+
+# set PLOTASSIST_PROFILE=1 to record from startup; otherwise enable it from the debug panel (F12)
+profiler = Profiler(enabled=bool(os.environ.get("PLOTASSIST_PROFILE")))
+
 def set_entry_placeholder(entry: tk.Entry, placeholder: str, color="gray", normal_color="black"):
     def on_focus_in(event):
         if entry.get() == placeholder:
@@ -31,47 +155,1092 @@ def set_entry_placeholder(entry: tk.Entry, placeholder: str, color="gray", norma
     entry.bind("<FocusIn>", on_focus_in)
     entry.bind("<FocusOut>", on_focus_out)
 
+SEARCH_DELAY_MS = 150
+
+def bind_search(entry: tk.Entry, on_change, placeholder: str = "Search channels...", delay: int = SEARCH_DELAY_MS):
+    # keystrokes only (re)arm a timer; the query runs once typing pauses and the text actually changed
+    pending = None
+    last_text = ""
+
+    def fire():
+        nonlocal pending, last_text
+        pending = None
+        text = entry.get().strip()
+        if text == placeholder:
+            text = ""
+        if text != last_text:
+            last_text = text
+            on_change(text)
+
+    def on_key_release(event):
+        nonlocal pending
+        if pending is not None:
+            entry.after_cancel(pending)
+        pending = entry.after(delay, fire)
+
+    entry.bind("<KeyRelease>", on_key_release)
+
+def highlight_mask(values: np.ndarray, mode: str, value: str | None) -> np.ndarray | None:
+    if mode not in FILTER_MODES or value in (None, ""):
+        return None
+
+    values = np.asarray(values)
+    if mode == "isin":
+        vals = []
+        for val in value.split(","):
+            try:
+                vals.append(float(val.strip()))
+            except ValueError:
+                continue
+        if not vals:
+            return None
+        return np.isin(values, vals)
+
+    try:
+        val = float(value)
+    except ValueError:
+        return None
+
+    with np.errstate(invalid='ignore'):
+        match mode:
+            case "==":
+                return values == val
+            case ">=":
+                return values >= val
+            case "<=":
+                return values <= val
+            case ">":
+                return values > val
+            case "<":
+                return values < val
+
+def find_spans(mask: np.ndarray) -> np.ndarray:
+    # (start, end) positions of every run of True, both ends inclusive
+    mask = np.ascontiguousarray(mask, dtype=bool)
+    if mask.size == 0:
+        return np.empty((0, 2), dtype=np.intp)
+    edges = np.diff(mask.view(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return np.column_stack((starts, ends))
+
+def index_to_x(index: pd.Index) -> np.ndarray:
+    # float64 Matplotlib x coordinates for an index, computed once and shared read-only
+    if isinstance(index, pd.DatetimeIndex):
+        x = mdates.date2num(index)
+    else:
+        x = np.asarray(index, dtype=np.float64)
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    x.flags.writeable = False
+    return x
+
+def merge_spans(x0: np.ndarray, x1: np.ndarray, min_gap: float) -> tuple[np.ndarray, np.ndarray]:
+    if len(x0) == 0:
+        return x0, x1
+    keep = np.flatnonzero(x0[1:] - x1[:-1] > min_gap)
+    starts = np.concatenate((x0[:1], x0[1:][keep]))
+    ends = np.concatenate((x1[keep], x1[-1:]))
+    return starts, ends
+
+def minmax_decimate(values: np.ndarray, n_buckets: int) -> np.ndarray:
+    # positions of the min and max of every bucket plus both end points, in order
+    n = len(values)
+    if n_buckets <= 0 or n <= 2 * n_buckets:
+        return np.arange(n)
+
+    values = np.asarray(values, dtype=np.float64)
+    size = -(-n // n_buckets)
+    full = n // size * size
+    blocks = values[:full].reshape(-1, size)
+    nan = np.isnan(blocks)
+    offsets = np.arange(0, full, size)
+    positions = [
+        offsets + np.where(nan, np.inf, blocks).argmin(axis=1),
+        offsets + np.where(nan, -np.inf, blocks).argmax(axis=1),
+        [0, n - 1],
+    ]
+    if full < n:
+        tail = values[full:]
+        if not np.isnan(tail).all():
+            positions.append([full + np.nanargmin(tail), full + np.nanargmax(tail)])
+    return np.unique(np.concatenate(positions))
+
+class PixelIndex:
+    # uniform grid over display coordinates for nearest-point queries
+    CELL = 8
+
+    def __init__(self, points: np.ndarray, owners: np.ndarray, positions: np.ndarray):
+        finite = np.isfinite(points).all(axis=1)
+        points, owners, positions = points[finite], owners[finite], positions[finite]
+        self.origin = points.min(axis=0) if len(points) else np.zeros(2)
+        cells = ((points - self.origin) // self.CELL).astype(np.int64)
+        self.n_rows = int(cells[:, 1].max()) + 1 if len(cells) else 1
+        self.n_cols = int(cells[:, 0].max()) + 1 if len(cells) else 1
+        keys = cells[:, 0] * self.n_rows + cells[:, 1]
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.points = points[order]
+        self.owners = owners[order]
+        self.positions = positions[order]
+
+    def query(self, x: float, y: float) -> tuple[int, int, float] | None:
+        if len(self.keys) == 0:
+            return None
+        cx, cy = ((np.array([x, y]) - self.origin) // self.CELL).astype(np.int64)
+        radius = 1
+        while True:
+            cols = np.arange(max(cx - radius, 0), min(cx + radius, self.n_cols - 1) + 1)
+            row_lo, row_hi = max(cy - radius, 0), min(cy + radius, self.n_rows - 1)
+            if len(cols) and row_lo <= row_hi:
+                lo = np.searchsorted(self.keys, cols * self.n_rows + row_lo, side='left')
+                hi = np.searchsorted(self.keys, cols * self.n_rows + row_hi, side='right')
+                candidates = np.concatenate([np.arange(a, b) for a, b in zip(lo, hi)])
+            else:
+                candidates = np.empty(0, dtype=np.intp)
+            covers_all = cx - radius <= 0 and cy - radius <= 0 and cx + radius >= self.n_cols - 1 and cy + radius >= self.n_rows - 1
+            if len(candidates):
+                distances = np.hypot(self.points[candidates, 0] - x, self.points[candidates, 1] - y)
+                best = int(np.argmin(distances))
+                # anything outside the searched square is at least radius cells away
+                if distances[best] <= radius * self.CELL or covers_all:
+                    hit = candidates[best]
+                    return int(self.owners[hit]), int(self.positions[hit]), float(distances[best])
+            elif covers_all:
+                return None
+            radius *= 2
+
+MARKER_CAP = 256
+
+class MarkerPool:
+    # all click markers of one axes share a single collection; labels come from a reused pool
+    def __init__(self, ax, cap: int = MARKER_CAP):
+        self.ax = ax
+        self.cap = cap
+        self.entries: list[tuple[int, float, float, object, str]] = []
+        self.labels = []
+        marker = MarkerStyle('o')
+        self.collection = PathCollection(
+            [marker.get_path().transformed(marker.get_transform())], sizes=[16],
+            offsets=np.empty((0, 2)), offset_transform=ax.transData,
+            edgecolors='black', linewidths=1, zorder=5, label='_nolegend_', animated=True
+        )
+        self.collection.set_transform(IdentityTransform())
+        ax.add_collection(self.collection, autolim=False)
+
+    def add(self, click: int, x: float, y: float, color, text: str) -> None:
+        self.entries.append((click, x, y, color, text))
+        if len(self.entries) > self.cap:
+            del self.entries[:len(self.entries) - self.cap]
+
+    def drop(self, click: int) -> None:
+        while self.entries and self.entries[-1][0] == click:
+            self.entries.pop()
+
+    def clear(self) -> None:
+        self.entries = []
+
+    def sync(self) -> None:
+        self.collection.set_offsets(np.array([(x, y) for _, x, y, _, _ in self.entries]).reshape(-1, 2))
+        self.collection.set_facecolors([color for _, _, _, color, _ in self.entries])
+        while len(self.labels) < len(self.entries):
+            self.labels.append(self.ax.annotate(
+                "",
+                xy=(0, 0),
+                xytext=(0, 10),
+                textcoords='offset points',
+                ha='center',
+                va='bottom',
+                color='black',
+                fontsize=8,
+                animated=True
+            ))
+        for i, label in enumerate(self.labels):
+            if i < len(self.entries):
+                _, x, y, _, text = self.entries[i]
+                label.xy = (x, y)
+                label.set_text(text)
+            label.set_visible(i < len(self.entries))
+
+    def artists(self) -> list:
+        return [self.collection] + self.labels[:len(self.entries)]
+
+    def remove(self) -> None:
+        self.collection.remove()
+        for label in self.labels:
+            label.remove()
+
+class ClickOverlay:
+    # click markers are animated artists blitted over a cached background of each axes
+    def __init__(self, fig, cap: int = MARKER_CAP):
+        self.fig = fig
+        self.canvas = fig.canvas
+        self.cap = cap
+        self.pools: dict[object, MarkerPool] = {}
+        self.backgrounds: dict[object, object] = {}
+        self._clicks: list[tuple[int, list]] = []
+        self._next_click = 0
+        self._cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add_click(self, markers) -> list:
+        # markers: (ax, x, y, color, text); one click may mark several axes and is undone as a unit
+        click = self._next_click
+        self._next_click += 1
+        axes = []
+        for ax, x, y, color, text in markers:
+            if ax not in self.pools:
+                self.pools[ax] = MarkerPool(ax, self.cap)
+            self.pools[ax].add(click, x, y, color, text)
+            if ax not in axes:
+                axes.append(ax)
+        for ax in axes:
+            self.pools[ax].sync()
+        self._clicks.append((click, axes))
+        if len(self._clicks) > self.cap:
+            del self._clicks[0]
+        return axes
+
+    def undo(self) -> list:
+        if not self._clicks:
+            return []
+        click, axes = self._clicks.pop()
+        axes = [ax for ax in axes if ax in self.pools]
+        for ax in axes:
+            self.pools[ax].drop(click)
+            self.pools[ax].sync()
+        return axes
+
+    def clear(self) -> list:
+        axes = list(self.pools)
+        for pool in self.pools.values():
+            pool.clear()
+            pool.sync()
+        self._clicks = []
+        return axes
+
+    def forget(self, ax) -> None:
+        pool = self.pools.pop(ax, None)
+        if pool is not None:
+            pool.remove()
+        self.backgrounds.pop(ax, None)
+
+    def _on_draw(self, event):
+        # a full draw skips animated artists, so the buffer holds a clean background right now;
+        # savefig may render through a different canvas, which only needs the markers drawn
+        if event.canvas is self.canvas and self.canvas.supports_blit:
+            self.backgrounds = {ax: self.canvas.copy_from_bbox(ax.bbox) for ax in self.fig.axes}
+        for pool in self.pools.values():
+            for artist in pool.artists():
+                artist.draw(event.renderer)
+
+    @profiler.timed("draw.blit")
+    def refresh(self, axes) -> None:
+        if not self.canvas.supports_blit or any(ax not in self.backgrounds for ax in axes):
+            self.canvas.draw_idle()
+            return
+        for ax in axes:
+            self.canvas.restore_region(self.backgrounds[ax])
+            if ax in self.pools:
+                for artist in self.pools[ax].artists():
+                    ax.draw_artist(artist)
+            self.canvas.blit(ax.bbox)
+
+class HighlightLayer:
+    # one collection per highlight rule and axis, re-merged to pixel resolution on zoom
+    def __init__(self, ax, x0: np.ndarray, x1: np.ndarray, color: str):
+        self.ax = ax
+        self.x0 = x0
+        self.x1 = x1
+        self.collection = PolyCollection(
+            [], facecolors=color, edgecolors='none', alpha=0.5,
+            transform=ax.get_xaxis_transform(), label='_nolegend_'
+        )
+        ax.add_collection(self.collection, autolim=False)
+        self._cid = ax.callbacks.connect('xlim_changed', self.update)
+        self.update()
+
+    @profiler.timed("highlight.layer")
+    def update(self, *args):
+        xmin, xmax = sorted(self.ax.get_xlim())
+        pixel = (xmax - xmin) / max(self.ax.bbox.width, 1.0)
+
+        lo = np.searchsorted(self.x1, xmin, side='left')
+        hi = np.searchsorted(self.x0, xmax, side='right')
+        x0, x1 = merge_spans(self.x0[lo:hi], self.x1[lo:hi], pixel)
+        x1 = np.maximum(x1, x0 + pixel)
+
+        verts = np.empty((len(x0), 4, 2))
+        verts[:, 0, 0] = x0
+        verts[:, 1, 0] = x0
+        verts[:, 2, 0] = x1
+        verts[:, 3, 0] = x1
+        verts[:, :, 1] = (0, 1, 1, 0)
+        self.collection.set_verts(verts)
+
+    def remove(self):
+        self.ax.callbacks.disconnect(self._cid)
+        self.collection.remove()
+
+PYRAMID_BASE = 16
+
+class ChannelPyramid:
+    # min/max/first/last of power-of-two buckets, from PYRAMID_BASE samples upwards; a 2-D
+    # (samples, channels) block gets one pyramid whose levels carry a column per channel
+    def __init__(self, values: np.ndarray):
+        self.length = n = len(values)
+        self.levels: list[dict[str, np.ndarray]] = []
+        if n < 2 * PYRAMID_BASE:
+            return
+
+        self._pos_dtype = np.int32 if n < 2**31 else np.int64
+        level = self._leaves(values, 0, -(-n // PYRAMID_BASE))
+        self.levels.append(level)
+        while len(level['min']) > 1:
+            if len(level['min']) % 2:
+                level = {key: np.concatenate((arr, arr[-1:])) for key, arr in level.items()}
+            level = self._merge(
+                {key: arr[0::2] for key, arr in level.items()},
+                {key: arr[1::2] for key, arr in level.items()},
+            )
+            self.levels.append(level)
+
+    @classmethod
+    def blank(cls, shape: tuple[int, ...]) -> "ChannelPyramid":
+        # the layout of an all-NaN array's pyramid without scanning one; fill it in with update()
+        pyramid = cls(np.empty((0,) + tuple(shape[1:])))
+        pyramid.length = n = shape[0]
+        if n < 2 * PYRAMID_BASE:
+            return pyramid
+        pyramid._pos_dtype = np.int32 if n < 2**31 else np.int64
+        n_buckets = -(-n // PYRAMID_BASE)
+        while True:
+            bucket_shape = (n_buckets,) + tuple(shape[1:])
+            pyramid.levels.append({
+                'min': np.full(bucket_shape, np.nan),
+                'min_pos': np.zeros(bucket_shape, dtype=pyramid._pos_dtype),
+                'max': np.full(bucket_shape, np.nan),
+                'max_pos': np.zeros(bucket_shape, dtype=pyramid._pos_dtype),
+                'first': np.full(bucket_shape, np.nan),
+                'last': np.full(bucket_shape, np.nan),
+            })
+            if n_buckets == 1:
+                return pyramid
+            n_buckets = -(-n_buckets // 2)
+
+    def _leaves(self, values: np.ndarray, b0: int, b1: int) -> dict[str, np.ndarray]:
+        n = self.length
+        lo, hi = b0 * PYRAMID_BASE, min(b1 * PYRAMID_BASE, n)
+        columns = values.shape[1:]
+        padded = np.full(((b1 - b0) * PYRAMID_BASE,) + columns, np.nan)
+        padded[:hi - lo] = values[lo:hi]
+        blocks = padded.reshape((-1, PYRAMID_BASE) + columns)
+        nan = np.isnan(blocks)
+        starts = np.arange(lo, lo + len(padded), PYRAMID_BASE)
+        offsets = starts.reshape((-1,) + (1,) * len(columns))
+        mn_arg = np.where(nan, np.inf, blocks).argmin(axis=1)
+        mx_arg = np.where(nan, -np.inf, blocks).argmax(axis=1)
+        return {
+            'min': np.take_along_axis(blocks, mn_arg[:, None], axis=1)[:, 0],
+            'min_pos': np.minimum(offsets + mn_arg, n - 1).astype(self._pos_dtype),
+            'max': np.take_along_axis(blocks, mx_arg[:, None], axis=1)[:, 0],
+            'max_pos': np.minimum(offsets + mx_arg, n - 1).astype(self._pos_dtype),
+            'first': blocks[:, 0].copy(),
+            'last': np.asarray(values[np.minimum(starts + PYRAMID_BASE, n) - 1], dtype=np.float64),
+        }
+
+    @staticmethod
+    def _merge(left: dict[str, np.ndarray], right: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        take_min = (right['min'] < left['min']) | np.isnan(left['min'])
+        take_max = (right['max'] > left['max']) | np.isnan(left['max'])
+        return {
+            'min': np.where(take_min, right['min'], left['min']),
+            'min_pos': np.where(take_min, right['min_pos'], left['min_pos']),
+            'max': np.where(take_max, right['max'], left['max']),
+            'max_pos': np.where(take_max, right['max_pos'], left['max_pos']),
+            'first': left['first'],
+            'last': right['last'],
+        }
+
+    def update(self, values: np.ndarray, lo: int, hi: int) -> None:
+        # recompute only the buckets above values[lo:hi] after an in-place write, bottom level first
+        if not self.levels or hi <= lo:
+            return
+        b0, b1 = lo // PYRAMID_BASE, -(-hi // PYRAMID_BASE)
+        for key, arr in self._leaves(values, b0, b1).items():
+            self.levels[0][key][b0:b1] = arr
+        for below, level in zip(self.levels, self.levels[1:]):
+            b0, b1 = b0 // 2, -(-b1 // 2)
+            left = np.arange(2 * b0, 2 * b1, 2)
+            right = np.minimum(left + 1, len(below['min']) - 1)
+            merged = self._merge(
+                {key: arr[left] for key, arr in below.items()},
+                {key: arr[right] for key, arr in below.items()},
+            )
+            for key, arr in merged.items():
+                level[key][b0:b1] = arr
+
+    @property
+    def nbytes(self) -> int:
+        return sum(arr.nbytes for level in self.levels for arr in level.values())
+
+    def level_for(self, lo: int, hi: int, n_buckets: int) -> int | None:
+        # the level whose buckets split [lo, hi) into at most n_buckets, or None if too fine
+        if n_buckets <= 0 or hi <= lo:
+            return None
+        size = 1 << max(int(np.ceil(np.log2((hi - lo) / n_buckets))), 0)
+        if size < PYRAMID_BASE:
+            return None
+        k = min(int(np.log2(size // PYRAMID_BASE)), len(self.levels) - 1)
+        return k if k >= 0 else None
+
+    def query(self, lo: int, hi: int, n_buckets: int, column: int | None = None) -> tuple[np.ndarray, np.ndarray] | None:
+        # first/min/max/last of at most n_buckets buckets covering [lo, hi), or None if too fine
+        k = self.level_for(lo, hi, n_buckets)
+        if k is None:
+            return None
+        size = PYRAMID_BASE << k
+        level = self.levels[k]
+        if column is not None:
+            level = {key: arr[:, column] for key, arr in level.items()}
+
+        b0, b1 = lo // size, -(-hi // size)
+        starts = np.arange(b0, b1, dtype=np.int64) * size
+        positions = np.column_stack((
+            starts,
+            level['min_pos'][b0:b1],
+            level['max_pos'][b0:b1],
+            np.minimum(starts + size, self.length) - 1,
+        ))
+        values = np.column_stack((
+            level['first'][b0:b1],
+            level['min'][b0:b1],
+            level['max'][b0:b1],
+            level['last'][b0:b1],
+        ))
+        order = np.argsort(positions, axis=1, kind='stable')
+        return (
+            np.take_along_axis(positions, order, axis=1).ravel(),
+            np.take_along_axis(values, order, axis=1).ravel(),
+        )
+
+SKETCH_SIZE = 512
+SKETCH_CHUNK = 65536
+
+class QuantileSketch:
+    # mergeable quantile summary: sorted representative values with the rank weight each stands for
+    def __init__(self, values: np.ndarray, weights: np.ndarray):
+        self.values = values
+        self.weights = weights
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, size: int = SKETCH_SIZE) -> "QuantileSketch":
+        values = np.asarray(values, dtype=np.float64)
+        values = np.sort(values[np.isfinite(values)])
+        return cls._compress(values, np.ones(len(values)), size)
+
+    @classmethod
+    def merge(cls, sketches: list["QuantileSketch"], size: int = SKETCH_SIZE) -> "QuantileSketch":
+        if not sketches:
+            return cls(np.empty(0), np.empty(0))
+        values = np.concatenate([sketch.values for sketch in sketches])
+        weights = np.concatenate([sketch.weights for sketch in sketches])
+        order = np.argsort(values, kind='stable')
+        return cls._compress(values[order], weights[order], size)
+
+    @classmethod
+    def _compress(cls, values: np.ndarray, weights: np.ndarray, size: int) -> "QuantileSketch":
+        if len(values) <= size:
+            return cls(values, weights)
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        targets = (np.arange(size) + 0.5) * (total / size)
+        picks = np.minimum(np.searchsorted(cumulative, targets, side='left'), len(values) - 1)
+        return cls(values[picks], np.full(size, total / size))
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def quantile(self, q: float) -> float:
+        if len(self.values) == 0:
+            return float('nan')
+        cumulative = np.cumsum(self.weights)
+        # rank of each representative's middle sample; exact unit-weight sketches match pandas' linear quantile
+        ranks = cumulative - (self.weights + 1) / 2
+        return float(np.interp(q * (cumulative[-1] - 1), ranks, self.values))
+
+class ChannelSketch:
+    # one QuantileSketch per SKETCH_CHUNK samples, so any window merges whole chunks plus two edges
+    def __init__(self, values: np.ndarray):
+        self.length = len(values)
+        self.chunks = [
+            QuantileSketch.from_values(values[start:start + SKETCH_CHUNK])
+            for start in range(0, len(values), SKETCH_CHUNK)
+        ]
+        self.total = QuantileSketch.merge(self.chunks)
+
+    def window(self, values: np.ndarray, lo: int, hi: int) -> QuantileSketch:
+        if lo <= 0 and hi >= self.length:
+            return self.total
+        first, last = -(-lo // SKETCH_CHUNK), hi // SKETCH_CHUNK
+        if first >= last:
+            return QuantileSketch.from_values(values[lo:hi])
+        return QuantileSketch.merge(self.chunks[first:last] + [
+            QuantileSketch.from_values(values[lo:first * SKETCH_CHUNK]),
+            QuantileSketch.from_values(values[last * SKETCH_CHUNK:hi]),
+        ])
+
+def padded_limits(q_low: float, q_high: float) -> tuple[float, float] | None:
+    if not (np.isfinite(q_low) and np.isfinite(q_high)):
+        return None
+    space = 0.1 * (q_high - q_low)
+    if space == 0:
+        space = 0.1 * abs(q_high) if q_high != 0 else 1.0
+    return q_low - space, q_high + space
+
+STORAGE_MODES = ("frame", "block")
+FLOAT32_RTOL = 1e-6
+
+def fits_float32(values: np.ndarray) -> bool:
+    # close enough rather than lossless: the rounding error may reach FLOAT32_RTOL of the range
+    if values.dtype == np.float32:
+        return True
+    with np.errstate(over='ignore', invalid='ignore'):
+        as32 = values.astype(np.float32)
+    if not np.issubdtype(values.dtype, np.floating):
+        return bool(np.array_equal(as32, values))
+    finite = np.isfinite(values)
+    if not np.array_equal(np.isfinite(as32), finite):
+        return False
+    if not finite.any():
+        return True
+    # rounding error must stay invisible next to the channel's own range
+    span = np.ptp(values[finite])
+    error = np.abs(as32[finite] - values[finite]).max()
+    return bool(error <= FLOAT32_RTOL * span) if span > 0 else bool(error == 0)
+
+def check_index(idx: pd.Index) -> None:
+    if not (isinstance(idx, pd.DatetimeIndex) or pd.api.types.is_integer_dtype(idx) or pd.api.types.is_float_dtype(idx)):
+        raise ValueError("DataFrame index must be DatetimeIndex or numeric.")
+
+def parse_index(values: pd.Series, name) -> pd.Index:
+    if not pd.api.types.is_numeric_dtype(values):
+        try:
+            values = pd.to_datetime(values)
+        except ValueError:
+            # pandas writes whole seconds without a fraction, which defeats format inference
+            values = pd.to_datetime(values, format='ISO8601')
+    return pd.Index(values, name=name)
+
+@profiler.timed("load.coerce")
+def coerce_channel(values: pd.Series, name: str) -> np.ndarray:
+    values = pd.to_numeric(values, errors='coerce')
+    if not pd.api.types.is_numeric_dtype(values):
+        raise ValueError(f"Column '{name}' must be numeric for plotting/highlighting.")
+    return values.to_numpy()
+
+class ChannelGroups:
+    # channel -> group map plus ordered group -> members lists; a group's number is its rank,
+    # so dropping or reordering groups never renumbers channels one by one
+    def __init__(self):
+        self._groups: list[int] = []
+        self._members: dict[int, list[str]] = {}
+        self._group_of: dict[str, int] = {}
+        self._next_id = 1
+        self._ranks: dict[int, int] | None = None
+        self._offsets: list[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._group_of)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._group_of
+
+    def _changed(self) -> None:
+        self._ranks = None
+        self._offsets = None
+
+    def _new_group(self, channels: list[str]) -> int:
+        group = self._next_id
+        self._next_id += 1
+        self._members[group] = list(channels)
+        for channel in channels:
+            self._group_of[channel] = group
+        return group
+
+    def _take(self, channels) -> dict[int, list[str]]:
+        # detach channels from their groups and report which groups they left
+        taken: dict[int, list[str]] = {}
+        for channel in channels:
+            group = self._group_of.pop(channel, None)
+            if group is not None:
+                taken.setdefault(group, []).append(channel)
+        for group, names in taken.items():
+            gone = set(names)
+            self._members[group] = [name for name in self._members[group] if name not in gone]
+        return taken
+
+    def _drop_empty(self, groups) -> None:
+        empty = {group for group in groups if not self._members.get(group)}
+        if empty:
+            for group in empty:
+                self._members.pop(group, None)
+            self._groups = [group for group in self._groups if group not in empty]
+
+    def _rank(self, group: int) -> int:
+        if self._ranks is None:
+            self._ranks = {group: rank for rank, group in enumerate(self._groups)}
+        return self._ranks[group]
+
+    def group_number(self, name: str) -> int:
+        return self._rank(self._group_of[name]) + 1
+
+    def add_group(self, channels: list[str]) -> None:
+        self._drop_empty(self._take(channels))
+        self._groups.append(self._new_group(channels))
+        self._changed()
+
+    def name_at(self, position: int) -> str:
+        if self._offsets is None:
+            self._offsets = [0]
+            for group in self._groups:
+                self._offsets.append(self._offsets[-1] + len(self._members[group]))
+        rank = bisect.bisect_right(self._offsets, position) - 1
+        return self._members[self._groups[rank]][position - self._offsets[rank]]
+
+    def __getitem__(self, position: int) -> tuple[str, int]:
+        name = self.name_at(position)
+        return name, self.group_number(name)
+
+    def names_at(self, positions) -> list[str]:
+        return [self.name_at(position) for position in positions]
+
+    def group_lists(self) -> list[tuple[int, list[str]]]:
+        return [(rank, self._members[group]) for rank, group in enumerate(self._groups, 1)]
+
+    def rows(self) -> list[tuple[str, int]]:
+        return [(name, number) for number, names in self.group_lists() for name in names]
+
+    def to_dicts(self) -> list[dict[str, int]]:
+        return [{name: number} for number, group in enumerate(self._groups, 1) for name in self._members[group]]
+
+    @classmethod
+    def from_dicts(cls, channel_dicts: list[dict[str, int]]) -> "ChannelGroups":
+        # groups in order of their numbers, members in list order; the numbers need not be dense
+        by_number: dict[int, list[str]] = {}
+        for channel_dict in channel_dicts:
+            for name, number in channel_dict.items():
+                by_number.setdefault(number, []).append(name)
+        groups = cls()
+        for number in sorted(by_number):
+            groups.add_group(by_number[number])
+        return groups
+
+    def _ordered_groups(self, channels) -> list[int]:
+        groups = {self._group_of[channel] for channel in channels if channel in self._group_of}
+        return sorted(groups, key=self._rank)
+
+    def combine(self, channels: list[str]) -> None:
+        groups = self._ordered_groups(channels)
+        if not groups:
+            return
+        base = groups[0]
+        moved = [channel for channel in channels if channel in self._group_of and self._group_of[channel] != base]
+        self._drop_empty(self._take(moved))
+        self._members[base].extend(moved)
+        for channel in moved:
+            self._group_of[channel] = base
+        self._changed()
+
+    def split(self, channels: list[str]) -> None:
+        wanted = set(channels)
+        ordered = [name for group in self._ordered_groups(channels) for name in self._members[group] if name in wanted]
+        self._drop_empty(self._take(ordered))
+        for channel in ordered:
+            self._groups.append(self._new_group([channel]))
+        self._changed()
+
+    def remove(self, channels) -> None:
+        self._drop_empty(self._take(channels))
+        self._changed()
+
+    def move(self, channels: list[str], direction: str) -> None:
+        # every group touched by the selection moves as one merged group past its neighbour,
+        # wrapping around at either end
+        groups = self._ordered_groups(channels)
+        if not groups or direction not in ("up", "down"):
+            return
+        first, last = self._rank(groups[0]), self._rank(groups[-1])
+        if direction == "up":
+            anchor = self._groups[first - 1] if first > 0 else None
+        else:
+            anchor = self._groups[last + 1] if last < len(self._groups) - 1 else None
+
+        merged = groups[0]
+        for group in groups[1:]:
+            for channel in self._members.pop(group):
+                self._group_of[channel] = merged
+                self._members[merged].append(channel)
+        moving = set(groups)
+        self._groups = [group for group in self._groups if group not in moving]
+        if anchor is None:
+            position = len(self._groups) if direction == "up" else 0
+        else:
+            position = self._groups.index(anchor) + (direction == "down")
+        self._groups.insert(position, merged)
+        self._changed()
+
+SEARCH_GRAM = 3
+
+class ChannelSearch:
+    # pre-lowered names plus a trigram -> positions index; each query only verifies the
+    # candidates shared by all of its trigrams
+    def __init__(self, names: list[str]):
+        self.names = sorted(names)
+        self.lowered = [name.lower() for name in self.names]
+        self._grams = self._build()
+        self._last: tuple[str, list[int]] = ("", [])
+
+    def _build(self) -> dict[str, np.ndarray]:
+        grams: dict[str, list[int]] = {}
+        for position, name in enumerate(self.lowered):
+            for gram in {name[k:k + SEARCH_GRAM] for k in range(len(name) - SEARCH_GRAM + 1)}:
+                grams.setdefault(gram, []).append(position)
+        return {gram: np.array(positions) for gram, positions in grams.items()}
+
+    def query(self, text: str) -> list[str]:
+        text = text.lower()
+        last_text, last_hits = self._last
+        if last_text and last_text in text:
+            candidates = last_hits
+        elif len(text) >= SEARCH_GRAM:
+            postings = [self._grams.get(text[k:k + SEARCH_GRAM]) for k in range(len(text) - SEARCH_GRAM + 1)]
+            if any(posting is None for posting in postings):
+                candidates = []
+            else:
+                postings.sort(key=len)
+                hits = postings[0]
+                for posting in postings[1:]:
+                    hits = np.intersect1d(hits, posting, assume_unique=True)
+                candidates = hits.tolist()
+        else:
+            candidates = range(len(self.names))
+        hits = [position for position in candidates if text in self.lowered[position]]
+        self._last = (text, hits)
+        return [self.names[position] for position in hits]
+
+EXPRESSION_CHUNK = 65536
+EXPRESSION_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Pow: np.power,
+    ast.Mod: np.mod,
+}
+EXPRESSION_FUNCTIONS = {"abs": np.abs, "sqrt": np.sqrt, "log": np.log, "exp": np.exp}
+
+class ChannelExpression:
+    # parsed and checked once, then evaluated chunk by chunk into one output array so no step
+    # allocates a full-length temporary; `backticks` quote names that are not identifiers
+    def __init__(self, text: str, channels):
+        self.text = text
+        self._quoted: dict[str, str] = {}
+        source = re.sub(r"`([^`]*)`", self._quote, text).strip()
+        try:
+            self.root = ast.parse(source, mode='eval').body
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression '{text}': {e.msg}") from None
+        self.channels: set[str] = set()
+        self._check(self.root, channels)
+
+    def _quote(self, match) -> str:
+        placeholder = f"_q{len(self._quoted)}_"
+        self._quoted[placeholder] = match.group(1)
+        return placeholder
+
+    def _channel(self, node: ast.Name) -> str:
+        return self._quoted.get(node.id, node.id)
+
+    def _check(self, node, channels) -> None:
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return
+        if isinstance(node, ast.Name):
+            channel = self._channel(node)
+            if channel not in channels:
+                raise ValueError(f"Unknown channel '{channel}'.")
+            self.channels.add(channel)
+        elif isinstance(node, ast.BinOp) and type(node.op) in EXPRESSION_OPERATORS:
+            self._check(node.left, channels)
+            self._check(node.right, channels)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            self._check(node.operand, channels)
+        elif isinstance(node, ast.Call) and not node.keywords and len(node.args) == 1:
+            if isinstance(node.func, ast.Attribute) and node.func.attr == "shift":
+                shift = node.args[0]
+                if isinstance(shift, ast.UnaryOp) and isinstance(shift.op, ast.USub):
+                    shift = shift.operand
+                if not (isinstance(shift, ast.Constant) and type(shift.value) is int):
+                    raise ValueError("shift() takes a whole number of samples.")
+                self._check(node.func.value, channels)
+            elif isinstance(node.func, ast.Name) and node.func.id in EXPRESSION_FUNCTIONS:
+                self._check(node.args[0], channels)
+            else:
+                raise ValueError(f"Unsupported call in expression '{self.text}'.")
+        else:
+            raise ValueError(f"Unsupported syntax in expression '{self.text}'.")
+
+    def evaluate(self, get_values, n_rows: int, chunk: int = EXPRESSION_CHUNK) -> np.ndarray:
+        arrays = {channel: get_values(channel) for channel in self.channels}
+        out = np.empty(n_rows)
+        with np.errstate(all='ignore'):
+            for lo in range(0, n_rows, chunk):
+                hi = min(lo + chunk, n_rows)
+                out[lo:hi] = self._evaluate(self.root, arrays, lo, hi, n_rows)
+        return out
+
+    def _evaluate(self, node, arrays, lo: int, hi: int, n_rows: int):
+        if isinstance(node, ast.Constant):
+            return float(node.value)
+        if isinstance(node, ast.Name):
+            return np.asarray(arrays[self._channel(node)][lo:hi], dtype=np.float64)
+        if isinstance(node, ast.BinOp):
+            left = self._evaluate(node.left, arrays, lo, hi, n_rows)
+            right = self._evaluate(node.right, arrays, lo, hi, n_rows)
+            return EXPRESSION_OPERATORS[type(node.op)](left, right)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._evaluate(node.operand, arrays, lo, hi, n_rows)
+            return np.negative(operand) if isinstance(node.op, ast.USub) else operand
+        if isinstance(node.func, ast.Name):
+            return EXPRESSION_FUNCTIONS[node.func.id](self._evaluate(node.args[0], arrays, lo, hi, n_rows))
+
+        # x.shift(n)[i] == x[i - n]; rows shifted in from outside the data are NaN
+        shift = ast.literal_eval(node.args[0])
+        src_lo, src_hi = max(lo - shift, 0), min(hi - shift, n_rows)
+        shifted = np.full(hi - lo, np.nan)
+        if src_lo < src_hi:
+            shifted[src_lo + shift - lo:src_hi + shift - lo] = self._evaluate(node.func.value, arrays, src_lo, src_hi, n_rows)
+        return shifted
+
+DERIVED_BUDGET = 256 * 2**20
+
 class DataHandler():
-    def __init__(self, df: pd.DataFrame) -> None:
+    @profiler.timed("load.handler")
+    def __init__(self, df: pd.DataFrame, storage: str = "frame", float32: bool = False) -> None:
         # Data validation
         idx = df.index
-        if not (isinstance(idx, pd.DatetimeIndex) or pd.api.types.is_integer_dtype(idx) or pd.api.types.is_float_dtype(idx)):
-            raise ValueError("DataFrame index must be DatetimeIndex or numeric.")
+        check_index(idx)
+        if not idx.is_monotonic_increasing:
+            # window lookups below rely on a sorted index, so pay for the sort once here
+            df = df.sort_index(kind='stable')
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"storage must be one of {STORAGE_MODES}.")
+
+        columns: dict[str, np.ndarray] = {}
         for col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-            if not pd.api.types.is_numeric_dtype(df[col]):
-                raise ValueError(f"Column '{col}' must be numeric for plotting/highlighting.")
-        self.df = df
-        self.available_channels = sorted(df.columns)
-        self.selected_channels: list[dict[str, int]] = []
-        self.current_group = 1
-        self.index = df.index
+            columns[col] = coerce_channel(df[col], col)
+
+        if storage == "block":
+            columns = self._pack_columns(columns, len(df.index), float32)
+        elif float32:
+            columns = {name: values.astype(np.float32) if fits_float32(values) else values for name, values in columns.items()}
+        for values in columns.values():
+            values.flags.writeable = False
+
+        self.storage = storage
+        self._columns = columns
+        self._init_state(df.index, list(columns))
+
+    def _init_state(self, index: pd.Index, channels: list[str], x: np.ndarray | None = None) -> None:
+        self.available_channels = sorted(channels)
+        self._search: ChannelSearch | None = None
+        self.groups = ChannelGroups()
+        self.index = index
+        self.x = index_to_x(index) if x is None else x
+        self._pyramids: dict[str, ChannelPyramid] = {}
+        self._sketches: dict[str, ChannelSketch] = {}
+        self.derived_budget = DERIVED_BUDGET
+        self._virtual: dict[str, ChannelExpression] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._derived: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._derived_bytes = 0
 
     def get_index(self):
         return self.index
 
-    def get_channel_data(self, channel: str):
-        if channel in self.df.columns:
-            return self.df[channel]
+    def get_x(self) -> np.ndarray:
+        return self.x
 
-    def get_next_group(self):
-        self.current_group += 1
-        return self.current_group -1
+    def get_window(self, xmin: float, xmax: float) -> slice:
+        return slice(
+            int(np.searchsorted(self.x, xmin, side='left')),
+            int(np.searchsorted(self.x, xmax, side='right')),
+        )
+
+    @staticmethod
+    def _pack_columns(columns: dict[str, np.ndarray], n_rows: int, float32: bool) -> dict[str, np.ndarray]:
+        # one column-major block per dtype, so every channel is a contiguous view
+        by_dtype: dict[type, list[str]] = {np.float64: [], np.float32: []}
+        for name, values in columns.items():
+            by_dtype[np.float32 if float32 and fits_float32(values) else np.float64].append(name)
+
+        packed = {}
+        for dtype, names in by_dtype.items():
+            if not names:
+                continue
+            block = np.empty((n_rows, len(names)), dtype=dtype, order='F')
+            for j, name in enumerate(names):
+                block[:, j] = columns[name]
+                packed[name] = block[:, j]
+        return {name: packed[name] for name in columns}
+
+    @property
+    def df(self) -> pd.DataFrame:
+        # with float32 set, downcast channels come back rounded to within FLOAT32_RTOL of their range
+        return pd.DataFrame(self._columns, index=self.index, copy=False)
+
+    def has_channel(self, channel: str) -> bool:
+        return channel in self._columns or channel in self._virtual
+
+    def load_channels(self, channels) -> None:
+        # everything is resident already; LazyDataHandler reads what is missing in one pass
+        pass
+
+    def get_channel_data(self, channel: str):
+        # the stored values, so float32 channels are approximate in the same way as df
+        values = self.get_channel_values(channel)
+        if values is not None:
+            return pd.Series(values, index=self.index, name=channel, copy=False)
+
+    def get_channel_values(self, channel: str) -> np.ndarray | None:
+        if channel in self._virtual:
+            return self._get_virtual(channel)
+        return self._columns.get(channel)
+
+    def nbytes(self) -> int:
+        buffers = {}
+        for values in self._columns.values():
+            base = values.base if isinstance(values.base, np.ndarray) else values
+            buffers[id(base)] = base.nbytes
+        return sum(buffers.values())
+
+    def add_channel(self, channel: str, data) -> None:
+        values = np.asarray(data)
+        if values.shape != (len(self.index),):
+            raise ValueError(f"Channel '{channel}' must have one value per index entry.")
+        values.flags.writeable = False
+        self._columns[channel] = values
+        self.available_channels = sorted(set(self.available_channels) | {channel})
+        self._search = None
+        self.invalidate_channel(channel)
+
+    def add_virtual_channel(self, channel: str, expression: ChannelExpression) -> None:
+        # only the definition is stored; values are computed on first use and kept in an LRU
+        # bounded by derived_budget, dropped whenever a channel they read from changes
+        if self.has_channel(channel):
+            raise ValueError(f"Channel '{channel}' already exists.")
+        self._virtual[channel] = expression
+        for dependency in expression.channels:
+            self._dependents.setdefault(dependency, set()).add(channel)
+        self.available_channels = sorted(set(self.available_channels) | {channel})
+        self._search = None
+
+    def _get_virtual(self, channel: str) -> np.ndarray:
+        values = self._derived.get(channel)
+        if values is not None:
+            self._derived.move_to_end(channel)
+        else:
+            values = self._virtual[channel].evaluate(self.get_channel_values, len(self.index))
+            values.flags.writeable = False
+            self._derived[channel] = values
+            self._derived_bytes += values.nbytes
+        # trimmed on every use, not only on a miss, so a lowered budget or a refreshed channel
+        # that grew is brought back under derived_budget straight away
+        if self._derived_bytes > self.derived_budget:
+            for name in list(self._derived):
+                if self._derived_bytes <= self.derived_budget:
+                    break
+                if name != channel:
+                    self._derived_bytes -= self._derived.pop(name).nbytes
+        return values
+
+    @profiler.timed("search")
+    def search_channels(self, text: str) -> list[str]:
+        if self._search is None:
+            self._search = ChannelSearch(self.available_channels)
+        return self._search.query(text)
+
+    def invalidate_channel(self, channel: str) -> None:
+        self._pyramids.pop(channel, None)
+        self._sketches.pop(channel, None)
+        dropped = self._derived.pop(channel, None)
+        if dropped is not None:
+            self._derived_bytes -= dropped.nbytes
+        for dependent in self._dependents.get(channel, ()):
+            self.invalidate_channel(dependent)
+
+    @profiler.timed("autoscale.sketch")
+    def get_sketch(self, channel: str) -> ChannelSketch | None:
+        sketch = self._sketches.get(channel)
+        if sketch is None:
+            values = self.get_channel_values(channel)
+            if values is None:
+                return None
+            sketch = self._sketches[channel] = ChannelSketch(values)
+        return sketch
+
+    @profiler.timed("autoscale")
+    def group_ylim(self, channels: list[str], window: slice | None = None) -> tuple[float, float] | None:
+        sketches = []
+        for channel in channels:
+            sketch = self.get_sketch(channel)
+            if sketch is None:
+                continue
+            if window is None:
+                sketches.append(sketch.total)
+            else:
+                sketches.append(sketch.window(self.get_channel_values(channel), window.start, window.stop))
+        merged = QuantileSketch.merge(sketches)
+        return padded_limits(merged.quantile(0.01), merged.quantile(0.99))
+
+    @profiler.timed("plot.pyramid")
+    def get_pyramid(self, channel: str) -> ChannelPyramid | None:
+        pyramid = self._pyramids.get(channel)
+        if pyramid is None:
+            values = self.get_channel_values(channel)
+            if values is None:
+                return None
+            pyramid = self._pyramids[channel] = ChannelPyramid(values)
+        return pyramid
+
+    def pyramid_nbytes(self) -> int:
+        return sum(pyramid.nbytes for pyramid in self._pyramids.values())
+
+    def get_decimated(self, channel: str, lo: int, hi: int, n_points: int) -> tuple[np.ndarray, np.ndarray] | None:
+        values = self.get_channel_values(channel)
+        if values is None:
+            return None
+        if hi - lo > n_points:
+            served = self.get_pyramid(channel).query(lo, hi, n_points // 4)
+            if served is not None:
+                return served
+        positions = lo + minmax_decimate(values[lo:hi], n_points // 2)
+        return positions, values[positions]
+
+    @property
+    def selected_channels(self) -> list[dict[str, int]]:
+        return self.groups.to_dicts()
+
+    @selected_channels.setter
+    def selected_channels(self, channel_dicts: list[dict[str, int]]) -> None:
+        self.groups = ChannelGroups.from_dicts(channel_dicts)
 
     def select_channels(self, channels: list[str], keep_group = False) -> list[dict[str, int]]:
-        new_channels: list[dict[str, int]] = []
-        if not keep_group:
-            for channel in channels:
-                group = self.get_next_group()
-                new_channels.append({channel: group})
+        if keep_group:
+            self.groups.add_group(sorted(channels))
         else:
-            group = self.get_next_group()
             for channel in channels:
-                new_channels.append({channel: group})    
-
-        new_channels = sorted(new_channels, key=lambda x: list(x.keys())[0])
-        self.selected_channels.extend(new_channels)
-        return new_channels
+                self.groups.add_group([channel])
+        return [{channel: self.groups.group_number(channel)} for channel in sorted(channels)]
 
     def select_all_channels(self, listbox: tk.Listbox, keep_group = False) -> list[dict[str, int]]:
         if not isinstance(listbox, tk.Listbox):
@@ -80,48 +1249,21 @@ class DataHandler():
         return self.select_channels(channels, keep_group)
 
     def reorder_groups(self) -> list[dict[str, int]]:
-        unique_groups = sorted(set(channel_dict[list(channel_dict.keys())[0]] for channel_dict in self.selected_channels))
-        group_mapping = {old_group: new_group for new_group, old_group in enumerate(unique_groups, 1)}
-
-        for channel_dict in self.selected_channels:
-            channel_name = list(channel_dict.keys())[0]
-            channel_dict[channel_name] = group_mapping[channel_dict[channel_name]]
-
+        # group numbers are ranks, so the groups are always in order
+        warnings.warn("reorder_groups is no longer needed; use selected_channels.", DeprecationWarning, stacklevel=2)
         return self.selected_channels
 
     def combine_channels(self, channels: list[str]) -> list[dict[str, int]]:
-        base_group = None
-        for channel_dict in self.selected_channels:
-            channel_name = list(channel_dict.keys())[0]
-            if channel_name in channels:
-                base_group = channel_dict[channel_name]
-                break
-
-        if base_group is None:
-            return self.selected_channels
-
-        for channel_dict in self.selected_channels:
-            channel_name = list(channel_dict.keys())[0]
-            if channel_name in channels:
-                channel_dict[channel_name] = base_group
-
-        return self.reorder_groups()
+        self.groups.combine(channels)
+        return self.selected_channels
 
     def split_channels(self, channels: list[str]) -> list[dict[str, int]]:
-        for channel_dict in self.selected_channels:
-            channel_name = list(channel_dict.keys())[0]
-            if channel_name in channels:
-                channel_dict[channel_name] = self.get_next_group()
-
-        return self.reorder_groups()
+        self.groups.split(channels)
+        return self.selected_channels
 
     def remove_channels(self, channels: list[str]) -> list[dict[str, int]]:
-        self.selected_channels = [
-            channel_dict for channel_dict in self.selected_channels
-            if list(channel_dict.keys())[0] not in channels
-        ]
-
-        return self.reorder_groups()
+        self.groups.remove(channels)
+        return self.selected_channels
 
     def remove_all_channels(self, listbox) -> list[dict[str, int]]:
         if not isinstance(listbox, tk.Listbox):
@@ -134,105 +1276,976 @@ class DataHandler():
                 channels_to_remove.append(channel_name)
             else:
                 channels_to_remove.append(item)
-        self.selected_channels = [
-            channel_dict for channel_dict in self.selected_channels
-            if list(channel_dict.keys())[0] not in channels_to_remove
-        ]
-        return self.reorder_groups()
+        self.groups.remove(channels_to_remove)
+        return self.selected_channels
 
     def move(self, channels: list[str], direction: str) -> list[dict[str, int]]:
-        if direction not in ["up", "down"]:
-            return self.selected_channels
-
-        groups_to_move = set()
-        for channel_dict in self.selected_channels:
-            channel_name = list(channel_dict.keys())[0]
-            if channel_name in channels:
-                groups_to_move.add(channel_dict[channel_name])
-
-        if not groups_to_move:
-            return self.selected_channels
+        self.groups.move(channels, direction)
+        return self.selected_channels
 
-        all_groups = sorted(set(channel_dict[list(channel_dict.keys())[0]] for channel_dict in self.selected_channels))
+CACHE_SUFFIX = ".plotassist"
+CACHE_VERSION = 1
+
+class ColumnCache:
+    # .npy files next to a CSV, valid while the CSV's path, size and mtime are unchanged
+    def __init__(self, source: str):
+        self.source = os.path.abspath(source)
+        self.directory = self.source + CACHE_SUFFIX
+        stat = os.stat(self.source)
+        self.key = {'version': CACHE_VERSION, 'path': self.source, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        self.meta = None
+        try:
+            with open(os.path.join(self.directory, "meta.json")) as f:
+                meta = json.load(f)
+            if meta.get('key') == self.key:
+                self.meta = meta
+        except (OSError, ValueError):
+            pass
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name + ".npy")
+
+    def _save(self, name: str, values: np.ndarray) -> None:
+        tmp = self._path(name) + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, values)
+        os.replace(tmp, self._path(name))
+
+    def _load(self, name: str) -> np.ndarray | None:
+        try:
+            return np.load(self._path(name), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+    def load_index(self) -> tuple[pd.Index, np.ndarray, list[str], np.ndarray | None] | None:
+        if self.meta is None:
+            return None
+        values, x = self._load("index"), self._load("x")
+        if values is None or x is None:
+            return None
+        if self.meta['index_tz'] is not None:
+            index = pd.DatetimeIndex(values, name=self.meta['index_name']).tz_localize('UTC').tz_convert(self.meta['index_tz'])
+        else:
+            index = pd.Index(values, name=self.meta['index_name'])
+        order = self._load("order") if self.meta['sorted'] else None
+        return index, x, self.meta['channels'], order
+
+    def save_index(self, index: pd.Index, x: np.ndarray, channels: list[str], order: np.ndarray | None) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+
+        tz = str(index.tz) if isinstance(index, pd.DatetimeIndex) and index.tz is not None else None
+        self._save("index", (index.tz_convert('UTC').tz_localize(None) if tz else index).to_numpy())
+        self._save("x", x)
+        if order is not None:
+            self._save("order", order)
+
+        self.meta = {
+            'key': self.key, 'index_name': index.name, 'index_tz': tz,
+            'sorted': order is not None, 'channels': channels,
+        }
+        tmp = os.path.join(self.directory, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, os.path.join(self.directory, "meta.json"))
+
+    def load_column(self, position: int) -> np.ndarray | None:
+        return self._load(f"c{position}")
+
+    def save_columns(self, columns: dict[int, np.ndarray]) -> dict[int, np.ndarray]:
+        # written together, then handed back memory-mapped from the cache
+        for position, values in columns.items():
+            self._save(f"c{position}", values)
+        return {position: self._load(f"c{position}") for position in columns}
+
+CSV_SCAN_BLOCK = 16 * 2**20
+CSV_SCAN_WIDTH = 64
+
+def first_fields(block: bytes) -> np.ndarray | None:
+    # the text before the first comma of every complete line in block, as fixed-width bytes,
+    # looking no further than CSV_SCAN_WIDTH bytes into each line (None if a field is longer);
+    # blank lines are skipped like read_csv does
+    buf = np.frombuffer(block, dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    blank = ends - (buf[np.maximum(ends - 1, 0)] == ord("\r")) <= starts
+    starts = starts[~blank]
+    if not len(starts):
+        return np.empty(0, dtype="S1")
+    window = buf[np.minimum(starts[:, None] + np.arange(CSV_SCAN_WIDTH), len(buf) - 1)]
+    stop = (window == ord(",")) | (window == ord("\n")) | (window == ord("\r"))
+    if not stop.any(axis=1).all():
+        return None
+    lengths = stop.argmax(axis=1)
+    width = max(int(lengths.max()), 1)
+    chars = np.where(np.arange(width) < lengths[:, None], window[:, :width], 0).astype(np.uint8)
+    return np.ascontiguousarray(chars).view(f"S{width}").ravel()
+
+def parse_fields(fields: np.ndarray, name) -> pd.Index:
+    # numbers the way read_csv parses them, otherwise timestamps
+    strings = fields.astype(str)
+    try:
+        return pd.Index(pd.to_numeric(strings), name=name)
+    except ValueError:
+        return parse_index(pd.Series(strings), name)
+
+def scan_csv_index(path: str) -> pd.Index | None:
+    # the first column of a CSV from one byte scan, instead of tokenizing every column; None
+    # when the file quotes fields or the column does not parse consistently, for read_csv to handle
+    with open(path, "rb") as f:
+        header = f.readline()
+        name = pd.read_csv(io.BytesIO(header), nrows=0).columns[0]
+        parts = []
+        pos = len(header)
+        while True:
+            # each read starts on a line boundary and stops after its last complete line
+            f.seek(pos)
+            data = f.read(CSV_SCAN_BLOCK)
+            at_end = len(data) < CSV_SCAN_BLOCK
+            if at_end and data and not data.endswith(b"\n"):
+                data += b"\n"
+            cut = len(data) if at_end else data.rfind(b"\n") + 1
+            if cut == 0 and not at_end:
+                return None
+            if data.find(b'"', 0, cut) >= 0:
+                return None
+            fields = first_fields(memoryview(data)[:cut])
+            if fields is None:
+                return None
+            if len(fields):
+                parts.append(parse_fields(fields, name))
+            pos += cut
+            if at_end:
+                break
+    if not parts:
+        return None
+    try:
+        index = parts[0].append(parts[1:]) if len(parts) > 1 else parts[0]
+    except (TypeError, ValueError):
+        return None
+    if index.dtype == object:
+        return None
+    return index.rename(name)
+
+class LazyDataHandler(DataHandler):
+    # reads the index up front (a byte scan for CSVs) and channel columns on first use, all the
+    # columns a layout asks for in one pass, under a memory budget; with cache set, parsed
+    # columns are also kept in a ColumnCache next to the file
+    @profiler.timed("load.open")
+    def __init__(self, path: str, memory_budget: int = 512 * 2**20, float32: bool = False, cache: bool = False) -> None:
+        self.path = path
+        self.memory_budget = memory_budget
+        self.float32 = float32
+        self.storage = "lazy"
+        self._parquet = path.lower().endswith((".parquet", ".pq"))
+        self._cache = ColumnCache(path) if cache and not self._parquet else None
+
+        cached = self._cache.load_index() if self._cache is not None else None
+        if cached is not None:
+            index, x, channels, self._order = cached
+            self._setup_channels(channels)
+            self._init_state(index, channels, x)
+            return
 
-        if direction == "up":
-            min_group = min(groups_to_move)
-            current_group_idx = all_groups.index(min_group)
-
-            if current_group_idx == 0:
-                new_group = max(all_groups) + 1
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] in groups_to_move:
-                        channel_dict[channel_name] = new_group
-
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] not in groups_to_move:
-                        channel_dict[channel_name] = max(1, channel_dict[channel_name] - 1)
+        if self._parquet:
+            import pyarrow.parquet as pq
+            index = pd.read_parquet(path, columns=[]).index
+            schema = pq.read_schema(path)
+            metadata = schema.pandas_metadata or {}
+            # a RangeIndex is stored as a dict description rather than a column name
+            index_columns = {name for name in metadata.get('index_columns', []) if isinstance(name, str)}
+            channels = [name for name in schema.names if name not in index_columns]
+        else:
+            header = pd.read_csv(path, nrows=0).columns
+            channels = list(header[1:])
+            index = scan_csv_index(path)
+            if index is None:
+                index = parse_index(pd.read_csv(path, usecols=[0]).iloc[:, 0], header[0])
+
+        check_index(index)
+        self._order = None
+        if not index.is_monotonic_increasing:
+            self._order = np.argsort(index.to_numpy(), kind='stable')
+            index = index[self._order]
+
+        self._setup_channels(channels)
+        self._init_state(index, channels)
+        if self._cache is not None:
+            try:
+                self._cache.save_index(index, self.x, channels, self._order)
+            except OSError as e:
+                print("Error", f"Could not write cache for '{path}': {e}")
+                self._cache = None
+
+    def _setup_channels(self, channels: list[str]) -> None:
+        self._file_channels = {name: position for position, name in enumerate(channels)}
+        self._pinned: set[str] = set()
+        self._columns: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def has_channel(self, channel: str) -> bool:
+        return channel in self._file_channels or channel in self._columns or channel in self._virtual
+
+    def get_channel_values(self, channel: str) -> np.ndarray | None:
+        if channel in self._virtual:
+            return self._get_virtual(channel)
+        values = self._columns.get(channel)
+        if values is not None:
+            self._columns.move_to_end(channel)
+            return values
+        if channel not in self._file_channels:
+            return None
+        self.load_channels([channel])
+        return self._columns[channel]
+
+    def load_channels(self, channels) -> None:
+        # every file column these channels need, virtual ones included, read in one pass
+        wanted: list[str] = []
+        pending = list(channels)
+        while pending:
+            channel = pending.pop()
+            if channel in self._virtual:
+                pending.extend(self._virtual[channel].channels)
+            elif channel in self._file_channels and channel not in wanted:
+                wanted.append(channel)
+        missing = [channel for channel in wanted if channel not in self._columns]
+        if missing:
+            self._columns.update(self._read_columns(missing))
+        for channel in wanted:
+            self._columns.move_to_end(channel)
+        self._evict(keep=set(wanted))
+
+    @profiler.timed("load.column")
+    def _read_columns(self, channels: list[str]) -> dict[str, np.ndarray]:
+        columns = {}
+        if self._cache is not None:
+            for channel in channels:
+                values = self._cache.load_column(self._file_channels[channel])
+                if values is not None:
+                    columns[channel] = values
+        parse = [channel for channel in channels if channel not in columns]
+        if parse:
+            parsed = self._parse_columns(parse)
+            if self._cache is not None:
+                try:
+                    saved = self._cache.save_columns({self._file_channels[name]: values for name, values in parsed.items()})
+                    parsed = {name: saved[self._file_channels[name]] for name in parsed}
+                except OSError as e:
+                    print("Error", f"Could not write cache for '{self.path}': {e}")
+                    self._cache = None
+            columns.update(parsed)
+        for channel, values in columns.items():
+            if self.float32 and fits_float32(values):
+                values = columns[channel] = values.astype(np.float32)
+            values.flags.writeable = False
+        return columns
+
+    def _parse_columns(self, channels: list[str]) -> dict[str, np.ndarray]:
+        if self._parquet:
+            frame = pd.read_parquet(self.path, columns=channels)
+        else:
+            frame = pd.read_csv(self.path, usecols=channels)
+        columns = {}
+        for channel in channels:
+            values = coerce_channel(frame[channel], channel)
+            columns[channel] = values[self._order] if self._order is not None else values
+        return columns
+
+    def _evict(self, keep: set[str]) -> None:
+        # channels with a pyramid stay resident even over budget: zooming reads their raw
+        # values for the ragged bucket ends, and evicting them would re-parse the file each time
+        resident = sum(values.nbytes for values in self._columns.values())
+        for name in list(self._columns):
+            if resident <= self.memory_budget:
+                break
+            if name in keep or name in self._pinned or name in self._pyramids:
+                continue
+            resident -= self._columns.pop(name).nbytes
+
+    def add_channel(self, channel: str, data) -> None:
+        # derived channels cannot be re-read from the file, so they are never evicted
+        super().add_channel(channel, data)
+        self._pinned.add(channel)
+
+STREAM_CAPACITY = 2**18
+STREAM_REFRESH_MS = 100
+STREAM_MAX_FAILURES = 10
+STREAM_YLIM_SAMPLES = 4096
+
+class StreamingDataHandler(DataHandler):
+    # Rows go into a fixed-capacity ring buffer that is written twice (slot and slot + span), so
+    # the newest rows are always one contiguous view. append() may run on any thread; sync() runs
+    # on the UI thread and publishes those views as the ordinary DataHandler columns. The slack
+    # region lets the producer write that many rows before it touches a published snapshot.
+    # The mirror costs 2.25x the visible rows, so 100 channels at STREAM_CAPACITY hold a 470 MB
+    # block for 210 MB of data, plus about 150 MB of pyramid over one copy of the ring.
+    def __init__(self, df: pd.DataFrame, capacity: int = STREAM_CAPACITY):
+        check_index(df.index)
+        self.capacity = capacity
+        self._span = capacity + max(capacity // 8, 1)
+        self._names = list(df.columns)
+        self._positions = {name: j for j, name in enumerate(self._names)}
+        if isinstance(df.index, pd.DatetimeIndex):
+            self._tz = df.index.tz
+            index_dtype = np.dtype('M8[ns]')
+        else:
+            self._tz = None
+            index_dtype = df.index.dtype
+        self._index_values = np.zeros(2 * self._span, dtype=index_dtype)
+        self._x = np.full(2 * self._span, np.nan)
+        self._block = np.full((2 * self._span, len(self._names)), np.nan, order='F')
+        self._lock = threading.Lock()
+        self._written = 0
+        self._published = -1
+        self._start = 0
+        self._ring_pyramid = ChannelPyramid.blank((self._span, len(self._names)))
+        self._ring_synced = 0
+
+        self.storage = "stream"
+        self._columns: dict[str, np.ndarray] = {}
+        self._init_state(df.index[:0], self._names, x=np.empty(0))
+        self.append(df)
+        self.sync()
+
+    def append(self, rows: pd.DataFrame) -> None:
+        n = len(rows)
+        if n == 0:
+            return
+        index = rows.index
+        if self._tz is not None:
+            index = index.tz_convert(None)
+        index_values = np.asarray(index, dtype=self._index_values.dtype)
+        x = index_to_x(rows.index)
+        values = rows.reindex(columns=self._names).to_numpy(dtype=np.float64)
+        if n > 1 and (np.diff(x) < 0).any():
+            raise ValueError("Streamed rows must arrive in index order.")
+        skipped = max(n - self._span, 0)
+        if skipped:
+            index_values, x, values = index_values[skipped:], x[skipped:], values[skipped:]
+            n = self._span
+
+        with self._lock:
+            if self._written and x[0] < self._x[(self._written - 1) % self._span]:
+                raise ValueError("Streamed rows must arrive in index order.")
+            self._written += skipped
+            start = self._written % self._span
+            for lo, hi, offset in ((start, min(start + n, self._span), 0), (0, start + n - self._span, self._span - start)):
+                if hi <= lo:
+                    continue
+                part = slice(offset, offset + hi - lo)
+                for base in (0, self._span):
+                    self._index_values[base + lo:base + hi] = index_values[part]
+                    self._x[base + lo:base + hi] = x[part]
+                    self._block[base + lo:base + hi] = values[part]
+            self._written += n
+
+    @profiler.timed("stream.sync")
+    def sync(self) -> bool:
+        with self._lock:
+            written = self._written
+        if written == self._published:
+            return False
+        count = min(written, self.capacity)
+        self._start = (written - count) % self._span
+        self._published = written
+        window = slice(self._start, self._start + count)
+
+        index_values = self._index_values[window]
+        if self._tz is not None:
+            self.index = pd.DatetimeIndex(index_values).tz_localize('UTC').tz_convert(self._tz)
+        else:
+            self.index = pd.Index(index_values, copy=False)
+        self.x = self._x[window]
+        self.x.flags.writeable = False
+        for name, j in self._positions.items():
+            values = self._block[window, j]
+            values.flags.writeable = False
+            self._columns[name] = values
+            self.invalidate_channel(name)
+        return True
+
+    def add_channel(self, channel: str, data) -> None:
+        raise ValueError("Streamed data only takes derived channels; use add_virtual_channel.")
+
+    @profiler.timed("autoscale")
+    def group_ylim(self, channels: list[str], window: slice | None = None) -> tuple[float, float] | None:
+        # every sync moves the window, so a sketch would be rebuilt over the whole ring on each
+        # tick; take the quantiles from an evenly strided sample of the rows in view instead
+        window = window if window is not None else slice(0, len(self.x))
+        step = max((window.stop - window.start) // STREAM_YLIM_SAMPLES, 1)
+        samples = [self.get_channel_values(channel) for channel in channels]
+        samples = [values[window.start:window.stop:step] for values in samples if values is not None]
+        values = np.concatenate(samples) if samples else np.empty(0)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return None
+        q_low, q_high = np.quantile(values, (0.01, 0.99)).tolist()
+        return padded_limits(q_low, q_high)
+
+    def get_ring_pyramid(self) -> ChannelPyramid:
+        # one pyramid over the first copy of the ring, patched with the rows published since it
+        # was last used, for every channel in the same pass
+        pending = min(self._published - self._ring_synced, self._span)
+        start = (self._published - pending) % self._span
+        ring = self._block[:self._span]
+        for lo, hi in ((start, min(start + pending, self._span)), (0, start + pending - self._span)):
+            self._ring_pyramid.update(ring, lo, hi)
+        self._ring_synced = self._published
+        return self._ring_pyramid
+
+    def pyramid_nbytes(self) -> int:
+        return super().pyramid_nbytes() + self._ring_pyramid.nbytes
+
+    def get_decimated(self, channel: str, lo: int, hi: int, n_points: int) -> tuple[np.ndarray, np.ndarray] | None:
+        if channel not in self._positions or hi - lo <= n_points:
+            return super().get_decimated(channel, lo, hi, n_points)
+        values = self._columns[channel]
+        pyramid = self.get_ring_pyramid()
+        k = pyramid.level_for(lo, hi, n_points // 4)
+        if k is None:
+            positions = lo + minmax_decimate(values[lo:hi], n_points // 2)
+            return positions, values[positions]
+        # the pyramid covers one copy of the ring, so a window that wraps is served in two parts;
+        # ring buckets are aligned to the buffer, not the window: serve the whole buckets inside
+        # each part from the pyramid and the ragged ends from the raw values
+        size = PYRAMID_BASE << k
+        pieces = []
+        for offset in (self._start, self._start - self._span):
+            ring_lo, ring_hi = max(lo + offset, 0), min(hi + offset, self._span)
+            if ring_hi <= ring_lo:
+                continue
+            a = -(-ring_lo // size) * size
+            b = ring_hi // size * size
+            if a >= b:
+                a = b = ring_hi
+            head = ring_lo - offset + minmax_decimate(values[ring_lo - offset:a - offset], 1)
+            pieces.append((head, values[head]))
+            if a < b:
+                positions, served = pyramid.query(a, b, (b - a) // size, self._positions[channel])
+                pieces.append((positions - offset, served))
+            tail = b - offset + minmax_decimate(values[b - offset:ring_hi - offset], 1)
+            pieces.append((tail, values[tail]))
+        return np.concatenate([piece[0] for piece in pieces]), np.concatenate([piece[1] for piece in pieces])
+
+FOLLOW_BLOCK = 2**20
+FOLLOW_READ_LIMIT = 16 * 2**20
+
+class CsvTail:
+    # remembers the header and the byte offset just past the last parsed line, so each read()
+    # costs only what was appended since; an incomplete last line is left for the next read
+    def __init__(self, path: str, tail_rows: int):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.readline()
+        if not header.endswith(b"\n"):
+            raise ValueError(f"'{path}' has no complete header line.")
+        self.columns = list(pd.read_csv(io.BytesIO(header), nrows=0).columns)
+        self._numeric: bool | None = None
+        self.offset = self._tail_offset(len(header), tail_rows)
+
+    def _tail_offset(self, start: int, rows: int) -> int:
+        # walk back from the end until `rows` complete lines lie ahead, so opening a huge log
+        # only touches its tail
+        with open(self.path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            seen = 0
+            while pos > start:
+                size = min(FOLLOW_BLOCK, pos - start)
+                pos -= size
+                f.seek(pos)
+                newlines = np.flatnonzero(np.frombuffer(f.read(size), dtype=np.uint8) == ord("\n"))
+                if seen + len(newlines) > rows:
+                    return pos + int(newlines[len(newlines) - (rows + 1 - seen)]) + 1
+                seen += len(newlines)
+        return start
+
+    @profiler.timed("load.tail")
+    def read(self, limit: int | None = FOLLOW_READ_LIMIT) -> pd.DataFrame | None:
+        with open(self.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < self.offset:
+                print("Error", f"'{self.path}' shrank below the followed position; waiting for it to grow again.")
+                return None
+            f.seek(self.offset)
+            data = f.read(size - self.offset if limit is None else min(size - self.offset, limit))
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        self.offset += end
+        frame = self._parse(data[:end])
+        if frame.empty:
+            return None
+        frame.index = self._parse_index(frame.pop(self.columns[0]))
+        frame = frame[frame.index.notna()]
+        for name in frame.columns:
+            if not pd.api.types.is_numeric_dtype(frame[name]):
+                frame[name] = pd.to_numeric(frame[name], errors='coerce')
+        return frame
+
+    def _parse(self, data: bytes) -> pd.DataFrame:
+        # a rig log can carry the odd line with a missing or extra field; pandas either raises or,
+        # on the first line, silently shifts every column, so drop such lines and report them
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", pd.errors.ParserWarning)
+            try:
+                return pd.read_csv(io.BytesIO(data), header=None, names=self.columns, index_col=False)
+            except (pd.errors.ParserError, pd.errors.ParserWarning):
+                pass
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        good = [line for line in lines if line.count(b",") == len(self.columns) - 1]
+        print("Error", f"Skipped {len(lines) - len(good)} malformed line(s) in '{self.path}'.")
+        return pd.read_csv(io.BytesIO(b"\n".join(good)), header=None, names=self.columns, index_col=False)
+
+    def _parse_index(self, values: pd.Series) -> pd.Index:
+        # a logger restart repeats the header line; rows whose index cannot be read come back as
+        # NaN/NaT and are dropped by the caller
+        repeated = values.astype(str) == str(self.columns[0])
+        if repeated.any():
+            print("Error", f"Skipped {int(repeated.sum())} repeated header line(s) in '{self.path}'.")
+            values = values.mask(repeated)
+            numeric = pd.to_numeric(values, errors='coerce')
+            if numeric.notna().sum() == values.notna().sum():
+                values = numeric
+        index = None
+        if not (self._numeric and not pd.api.types.is_numeric_dtype(values)):
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", UserWarning)
+                    index = parse_index(values, self.columns[0])
+            except (ValueError, TypeError):
+                pass
+        if index is None:
+            numeric = pd.to_numeric(values, errors='coerce')
+            if self._numeric or (self._numeric is None and numeric.notna().any()):
+                index = pd.Index(numeric, name=self.columns[0])
             else:
-                target_group = all_groups[current_group_idx - 1]
-
-                channels_to_target = []
-                channels_to_original = []
-
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] in groups_to_move:
-                        channels_to_target.append(channel_name)
-                    elif channel_dict[channel_name] == target_group:
-                        channels_to_original.append(channel_name)
-
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] in groups_to_move:
-                        channel_dict[channel_name] = target_group
-
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] == target_group and channel_name not in channels_to_target:
-                        channel_dict[channel_name] = min_group
-
+                index = pd.Index(pd.to_datetime(values, errors='coerce', format='mixed'), name=self.columns[0])
+            bad = int(index.isna().sum() - values.isna().sum())
+            if bad:
+                print("Error", f"Skipped {bad} line(s) with an unreadable index in '{self.path}'.")
+        if self._numeric is None:
+            self._numeric = pd.api.types.is_numeric_dtype(index)
+        return index
+
+class FollowDataHandler(StreamingDataHandler):
+    # streams a CSV log that is still being written: opens on its last `capacity` rows and
+    # parses the newly appended lines on every sync
+    def __init__(self, path: str, capacity: int = STREAM_CAPACITY):
+        self.path = path
+        self._tail = CsvTail(path, capacity)
+        rows = self._tail.read(limit=None)
+        if rows is None or rows.empty:
+            raise ValueError(f"'{path}' has no data rows to follow yet.")
+        super().__init__(rows, capacity)
+
+    def sync(self) -> bool:
+        try:
+            rows = self._tail.read()
+            if rows is not None:
+                self.append(self._in_order(rows))
+        except (OSError, ValueError) as e:
+            print("Error", f"Could not follow '{self.path}': {e}")
+        return super().sync()
+
+    def _in_order(self, rows: pd.DataFrame) -> pd.DataFrame:
+        # a clock stepping back would stop the ring; drop rows older than what was already shown
+        x = index_to_x(rows.index)
+        with self._lock:
+            last = self._x[(self._written - 1) % self._span] if self._written else -np.inf
+        keep = x >= np.maximum.accumulate(np.concatenate(([last], x)))[:-1]
+        if not keep.all():
+            print("Error", f"Skipped {int((~keep).sum())} row(s) in '{self.path}' whose index went back in time.")
+            rows = rows[keep]
+        return rows
+
+class VirtualListbox(tk.Listbox):
+    # only the rows in view exist in Tk; size, get and curselection answer for the whole backing
+    # sequence, and selection is kept as backing positions so it survives scrolling
+    def __init__(self, master, format_row=str, **kwargs):
+        super().__init__(master, selectmode=tk.EXTENDED, activestyle='none', exportselection=False, **kwargs)
+        self._rows = []
+        self._format_row = format_row
+        self._top = 0
+        self._selected: set[int] = set()
+        self._anchor: int | None = None
+        self._active: int | None = None
+        self._scroll_command = None
+        self._line_height = tkfont.Font(font=self.cget('font')).metrics('linespace') + 1
+        self.bind("<Configure>", lambda event: self._render())
+        self.bind("<Button-1>", lambda event: self._on_click(event, "single"))
+        self.bind("<Shift-Button-1>", lambda event: self._on_click(event, "range"))
+        self.bind("<Control-Button-1>", lambda event: self._on_click(event, "toggle"))
+        self.bind("<B1-Motion>", self._on_drag)
+        self.bind("<MouseWheel>", lambda event: self._scroll(-1 if event.delta > 0 else 1, 3))
+        self.bind("<Button-4>", lambda event: self._scroll(-1, 3))
+        self.bind("<Button-5>", lambda event: self._scroll(1, 3))
+        # the Listbox class bindings would act on the few rendered rows and desync Tk's selection
+        # from _selected, so they are dropped and every key works on backing positions instead
+        self.bindtags(tuple(tag for tag in self.bindtags() if tag != "Listbox"))
+        for key, step in (("Up", -1), ("Down", 1), ("Prior", "-page"), ("Next", "page")):
+            self.bind(f"<{key}>", lambda event, step=step: self._on_key(step))
+            self.bind(f"<Shift-{key}>", lambda event, step=step: self._on_key(step, extend=True))
+        for key, step in (("Home", "first"), ("End", "last")):
+            for modifier in ("", "Control-"):
+                self.bind(f"<{modifier}{key}>", lambda event, step=step: self._on_key(step))
+                self.bind(f"<Shift-{modifier}{key}>", lambda event, step=step: self._on_key(step, extend=True))
+        self.bind("<space>", lambda event: self._on_key(0))
+        self.bind("<Select>", lambda event: self._on_key(0))
+        self.bind("<<SelectAll>>", lambda event: self._select(set(range(len(self._rows)))))
+        self.bind("<<SelectNone>>", lambda event: self._select(set()))
+
+    def set_rows(self, rows) -> None:
+        self._rows = rows
+        self._selected = set()
+        self._anchor = None
+        self._active = None
+        self._render()
+
+    def attach_scrollbar(self, scrollbar: tk.Scrollbar) -> None:
+        scrollbar.config(command=self.yview)
+        self._scroll_command = scrollbar.set
+        self._render()
+
+    def size(self) -> int:
+        return len(self._rows)
+
+    def _position(self, index) -> int:
+        return len(self._rows) - 1 if index == tk.END else int(index)
+
+    def get(self, first, last=None):
+        if last is None:
+            return self._format_row(self._rows[self._position(first)])
+        return tuple(self._format_row(self._rows[i]) for i in range(self._position(first), self._position(last) + 1))
+
+    def curselection(self) -> tuple[int, ...]:
+        return tuple(sorted(self._selected))
+
+    def _visible_count(self) -> int:
+        return max(1, self.winfo_height() // self._line_height)
+
+    def yview(self, *args):
+        n_rows = len(self._rows)
+        count = self._visible_count()
+        if not args:
+            if not n_rows:
+                return 0.0, 1.0
+            return self._top / n_rows, min(1.0, (self._top + count) / n_rows)
+        if args[0] == 'moveto':
+            self._top = int(float(args[1]) * n_rows)
+        elif args[0] == 'scroll':
+            self._top += int(args[1]) * (count if args[2] == 'pages' else 1)
+        self._render()
+
+    def _scroll(self, direction: int, units: int):
+        self.yview('scroll', direction * units, 'units')
+        return "break"
+
+    def _render(self) -> None:
+        count = self._visible_count()
+        self._top = max(0, min(self._top, len(self._rows) - count))
+        stop = min(self._top + count + 1, len(self._rows))
+        super().delete(0, tk.END)
+        super().insert(0, *(self._format_row(self._rows[i]) for i in range(self._top, stop)))
+        for i in range(self._top, stop):
+            if i in self._selected:
+                self.selection_set(i - self._top)
+        if self._scroll_command is not None:
+            self._scroll_command(*self.yview())
+
+    def _select(self, selected: set[int]):
+        self._selected = selected
+        self._render()
+        self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    def _on_click(self, event, mode: str):
+        self.focus_set()
+        if not self._rows:
+            return "break"
+        index = min(self._top + self.nearest(event.y), len(self._rows) - 1)
+        self._active = index
+        if mode == "range" and self._anchor is not None:
+            lo, hi = sorted((self._anchor, index))
+            return self._select(set(range(lo, hi + 1)))
+        self._anchor = index
+        if mode == "toggle":
+            return self._select(self._selected ^ {index})
+        return self._select({index})
+
+    def _on_drag(self, event):
+        if self._anchor is None or not self._rows:
+            return "break"
+        if event.y < 0:
+            self.yview('scroll', -1, 'units')
+        elif event.y > self.winfo_height():
+            self.yview('scroll', 1, 'units')
+        index = min(self._top + self.nearest(event.y), len(self._rows) - 1)
+        self._active = index
+        lo, hi = sorted((self._anchor, index))
+        return self._select(set(range(lo, hi + 1)))
+
+    def _on_key(self, step, extend: bool = False):
+        # step is a row offset, "page"/"-page", or "first"/"last"; extend keeps the anchor for a range
+        if not self._rows:
+            return "break"
+        count = self._visible_count()
+        active = self._active if self._active is not None else -1
+        if step == "first":
+            index = 0
+        elif step == "last":
+            index = len(self._rows) - 1
         else:
-            max_group = max(groups_to_move)
-            current_group_idx = all_groups.index(max_group)
-
-            if current_group_idx == len(all_groups) - 1:
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] in groups_to_move:
-                        channel_dict[channel_name] = 1
-
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] not in groups_to_move:
-                        channel_dict[channel_name] = channel_dict[channel_name] + 1
+            index = active + {"page": count, "-page": -count}.get(step, step)
+        index = min(max(index, 0), len(self._rows) - 1)
+        self._active = index
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + count:
+            self._top = index - count + 1
+        if extend and self._anchor is not None:
+            lo, hi = sorted((self._anchor, index))
+            return self._select(set(range(lo, hi + 1)))
+        self._anchor = index
+        return self._select({index})
+
+MONITOR_INTERVAL_MS = 100
+MONITOR_THRESHOLD_MS = 200
+MONITOR_SLOW = 32
+
+def callback_name(func) -> str:
+    # after() hides the scheduled function inside a local callit closure
+    if getattr(func, "__qualname__", "").endswith("after.<locals>.callit"):
+        for cell in func.__closure__ or ():
+            if callable(cell.cell_contents) and not isinstance(cell.cell_contents, tk.Misc):
+                func = cell.cell_contents
+                break
+    name = getattr(func, "__qualname__", None) or type(func).__qualname__
+    code = getattr(func, "__code__", None)
+    if "<lambda>" in name and code is not None:
+        name += f":{code.co_firstlineno}"
+    return name
+
+class LatencyMonitor:
+    # A heartbeat after() records how late the Tk event loop gets round to it (tk.lag), and every
+    # Tk callback and Matplotlib event dispatch is timed as callback.<name>. A watchdog thread
+    # samples the main-thread stack while a callback overruns the threshold, so slow() shows where
+    # it was stuck rather than who called it. Callbacks that run a nested event loop (dialogs)
+    # keep heartbeats flowing and are not reported. Everything records only while profiler.enabled,
+    # and the heartbeat and watchdog wind down once it is switched off.
+    def __init__(self, root: tk.Misc, profiler: Profiler, interval_ms: int = MONITOR_INTERVAL_MS, threshold_ms: int = MONITOR_THRESHOLD_MS):
+        self.root = root
+        self.profiler = profiler
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self._slow: list[dict] = []
+        self._running: list[list] = []
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._stop.set()
+        self._previous = tk.CallWrapper
+        self._due = 0
+        self._after = None
+        self._watchdog_thread: threading.Thread | None = None
+
+    def start(self) -> bool:
+        # wraps the Tk callbacks registered from now on, in every root of the process, so it is
+        # only installed while profiling and one monitor holds it at a time; a second is refused.
+        # The heartbeat and watchdog are armed by the first callback that runs while profiling.
+        if _MonitoredCallWrapper.monitor is self:
+            return True
+        if _MonitoredCallWrapper.monitor is not None:
+            return False
+        self._previous = tk.CallWrapper
+        _MonitoredCallWrapper.monitor = self
+        tk.CallWrapper = _MonitoredCallWrapper
+        self._stop = threading.Event()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+            self._after = None
+        if _MonitoredCallWrapper.monitor is self:
+            _MonitoredCallWrapper.monitor = None
+            tk.CallWrapper = self._previous
+
+    def watch(self, func):
+        if not self.profiler.enabled or _MonitoredCallWrapper.monitor is not self:
+            return self.profiler._null
+        if self._after is None or self._watchdog_thread is None or not self._watchdog_thread.is_alive():
+            self._arm()
+        return _CallbackWatch(self, func)
+
+    def _arm(self) -> None:
+        if self._stop.is_set():
+            return
+        if self._after is None:
+            self._due = time.perf_counter_ns() + self.interval_ms * 1_000_000
+            self._after = self.root.after(self.interval_ms, self._heartbeat)
+        if self._watchdog_thread is None or not self._watchdog_thread.is_alive():
+            self._watchdog_thread = threading.Thread(target=self._watchdog, name="plotassist-watchdog", daemon=True)
+            self._watchdog_thread.start()
+
+    def watch_canvas(self, canvas) -> None:
+        process = canvas.callbacks.process
+
+        def monitored(signal, *args, **kwargs):
+            with self.watch(f"mpl.{signal}"):
+                return process(signal, *args, **kwargs)
+
+        canvas.callbacks.process = monitored
+
+    def _heartbeat(self):
+        now = time.perf_counter_ns()
+        if self.profiler.enabled:
+            self.profiler.record("tk.lag", min(self._due, now), now)
+        for entry in self._running:
+            entry[3] = True
+        self._due = now + self.interval_ms * 1_000_000
+        self._after = None
+        if self.profiler.enabled and not self._stop.is_set():
+            self._after = self.root.after(self.interval_ms, self._heartbeat)
+
+    def _watchdog(self):
+        threshold = self.threshold_ms * 1_000_000
+        while self.profiler.enabled and not self._stop.wait(self.threshold_ms / 4000):
+            now = time.perf_counter_ns()
+            overrun = [entry for entry in list(self._running) if entry[2] is None and now - entry[1] > threshold]
+            frame = sys._current_frames().get(self._thread_id) if overrun else None
+            if frame is not None:
+                stack = "".join(traceback.format_stack(frame))
+                for entry in overrun:
+                    entry[2] = stack
+
+    def _finish(self, entry: list, end_ns: int) -> None:
+        func, start, stack, yielded = entry
+        name = func if isinstance(func, str) else callback_name(func)
+        self.profiler.record(f"callback.{name}", start, end_ns)
+        duration = (end_ns - start) / 1e6
+        if yielded or duration < self.threshold_ms:
+            return
+        self._slow.append({'name': name, 'ms': duration, 'time': time.time(), 'stack': stack})
+        self._slow.sort(key=lambda record: -record['ms'])
+        del self._slow[MONITOR_SLOW:]
+
+    def slow(self, n: int = 10) -> list[dict]:
+        return self._slow[:n]
+
+    def reset(self) -> None:
+        self._slow = []
+
+    def report(self, n: int = 10) -> str:
+        if not self._slow:
+            return f"No callback has taken longer than {self.threshold_ms} ms while recording."
+        parts = []
+        for record in self.slow(n):
+            when = time.strftime("%H:%M:%S", time.localtime(record['time']))
+            parts.append(f"{record['ms']:.0f} ms  {record['name']}  at {when}")
+            parts.append(record['stack'] or "  (finished before its stack could be sampled)\n")
+        return "\n".join(parts)
+
+class _MonitoredCallWrapper(tk.CallWrapper):
+    monitor: LatencyMonitor | None = None
+
+    def __call__(self, *args):
+        if self.monitor is None:
+            return super().__call__(*args)
+        with self.monitor.watch(self.func):
+            return super().__call__(*args)
+
+class _CallbackWatch:
+    __slots__ = ("monitor", "entry")
+
+    def __init__(self, monitor: LatencyMonitor, func):
+        self.monitor = monitor
+        self.entry = [func, 0, None, False]
+
+    def __enter__(self):
+        self.entry[1] = time.perf_counter_ns()
+        self.monitor._running.append(self.entry)
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.monitor._running.pop()
+        self.monitor._finish(self.entry, end)
+
+PROFILE_REFRESH_MS = 500
+
+class ProfilePanel(tk.Toplevel):
+    # live table of profiler.stats(), with switches to record, reset and save a Chrome trace
+    columns = ("count", "total", "mean") + tuple(f"p{q}" for q in PROFILE_PERCENTILES) + ("max",)
+
+    def __init__(self, master, profiler: Profiler, monitor: LatencyMonitor | None = None):
+        super().__init__(master)
+        self.profiler = profiler
+        self.monitor = monitor
+        self.title("Profile")
+        self.geometry("760x320")
+
+        controls = tk.Frame(self)
+        controls.pack(fill=tk.X, padx=8, pady=(8, 4))
+        self.enabled_var = tk.BooleanVar(value=profiler.enabled)
+        tk.Checkbutton(controls, text="Record", variable=self.enabled_var, command=self._toggle).pack(side=tk.LEFT)
+        tk.Button(controls, text="Reset", command=self._reset).pack(side=tk.LEFT, padx=(8, 0))
+        tk.Button(controls, text="Save trace...", command=self._save_trace).pack(side=tk.LEFT, padx=(8, 0))
+        if monitor is not None:
+            tk.Button(controls, text="Slow callbacks", command=self._show_slow).pack(side=tk.LEFT, padx=(8, 0))
+        tk.Label(controls, text="times in ms", font=("", 8)).pack(side=tk.RIGHT)
+
+        self.table = ttk.Treeview(self, columns=self.columns, show="tree headings")
+        self.table.heading("#0", text="stage")
+        self.table.column("#0", width=160)
+        for column in self.columns:
+            self.table.heading(column, text=column)
+            self.table.column(column, width=70, anchor='e')
+        self.table.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0, 8))
+        self._after = None
+        self._refresh()
+
+    def _toggle(self):
+        self.profiler.enabled = self.enabled_var.get()
+        if self.monitor is not None:
+            if self.profiler.enabled:
+                self.monitor.start()
             else:
-                target_group = all_groups[current_group_idx + 1]
-
-                channels_to_target = []
-                channels_to_original = []
-
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] in groups_to_move:
-                        channels_to_target.append(channel_name)
-                    elif channel_dict[channel_name] == target_group:
-                        channels_to_original.append(channel_name)
-
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] in groups_to_move:
-                        channel_dict[channel_name] = target_group
-
-                for channel_dict in self.selected_channels:
-                    channel_name = list(channel_dict.keys())[0]
-                    if channel_dict[channel_name] == target_group and channel_name not in channels_to_target:
-                        channel_dict[channel_name] = max_group
-
-        self.selected_channels.sort(key=lambda x: list(x.values())[0])
-
-        return self.reorder_groups()
+                self.monitor.stop()
+
+    def _reset(self):
+        self.profiler.reset()
+        if self.monitor is not None:
+            self.monitor.reset()
+        self._refresh()
+
+    def _save_trace(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json", filetypes=[("Chrome trace", "*.json")])
+        if path:
+            self.profiler.dump_chrome_trace(path)
+
+    def _show_slow(self):
+        window = tk.Toplevel(self)
+        window.title("Slow callbacks")
+        window.geometry("760x420")
+        text = tk.Text(window, wrap=tk.NONE, font=("Courier", 9))
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert("1.0", self.monitor.report())
+        text.config(state=tk.DISABLED)
+
+    def _refresh(self):
+        if self._after is not None:
+            self.after_cancel(self._after)
+        self.table.delete(*self.table.get_children())
+        for name, stat in sorted(self.profiler.stats().items(), key=lambda item: -item[1]['total']):
+            values = [stat['count']] + [f"{stat[column]:.2f}" for column in self.columns[1:]]
+            self.table.insert("", tk.END, text=name, values=values)
+        self._after = self.after(PROFILE_REFRESH_MS, self._refresh)
+
+    def destroy(self):
+        if self._after is not None:
+            self.after_cancel(self._after)
+            self._after = None
+        super().destroy()
 
 class SettingsManager:
     def __init__(self, data_handler: DataHandler, parent_frame):
@@ -260,30 +2273,16 @@ class SettingsManager:
         set_entry_placeholder(highlight_filter_entry, "Search channels...")
         highlight_filter_entry.pack(side=tk.LEFT, padx=(8, 0), fill=tk.X, expand=True)
 
-        _last_highlight_filter_text = ""
-        def on_highlight_filter_entry_change(event):
-            nonlocal _last_highlight_filter_text
-            new_text = highlight_filter_entry.get().strip()
-
-            if new_text != _last_highlight_filter_text:
-                current_values = ["None"]
-                if new_text == "" or new_text == "Search channels...":
-                    current_values.extend(sorted(self.data_handler.available_channels))
-                else:
-                    for col in self.data_handler.available_channels:
-                        if new_text.lower() in col.lower():
-                            current_values.append(col)
-                highlight_channel_dropdown['values'] = current_values
-                _last_highlight_filter_text = new_text
+        def on_highlight_filter_entry_change(new_text):
+            highlight_channel_dropdown['values'] = ["None"] + self.data_handler.search_channels(new_text)
 
-        highlight_filter_entry.bind("<KeyRelease>", on_highlight_filter_entry_change)
+        bind_search(highlight_filter_entry, on_highlight_filter_entry_change)
 
         filter_row = tk.Frame(highlight_frame)
         filter_row.pack(anchor='nw', pady=(8, 4), padx=8, fill=tk.X)
 
-        filter_modes = ["==", ">=", "<=", ">", "<", "isin"]
         filter_mode_var = tk.StringVar(value="==")
-        filter_mode_dropdown = ttk.Combobox(filter_row, textvariable=filter_mode_var, values=filter_modes, state="readonly", width=4)
+        filter_mode_dropdown = ttk.Combobox(filter_row, textvariable=filter_mode_var, values=FILTER_MODES, state="readonly", width=4)
         filter_mode_dropdown.pack(side=tk.LEFT)
 
         value_var = tk.StringVar(value="1")
@@ -348,27 +2347,24 @@ class SettingsManager:
         modifier_channel_dropdown.pack(side=tk.LEFT, padx=(0, 8))
         modifier_channel_dropdown.set("Modifier channel...")
 
-        _last_shared_filter_text = ""
-
-        def on_shared_filter_entry_change(event):
-            nonlocal _last_shared_filter_text
-            new_text = shared_filter_entry.get().strip()
-            if new_text == "Search channels...":
-                new_text = ""
-            if new_text != _last_shared_filter_text:
-                current_values = ["None"]
-                if new_text == "":
-                    current_values.extend(sorted(self.data_handler.available_channels))
-                else:
-                    lowered = new_text.lower()
-                    for col in self.data_handler.available_channels:
-                        if lowered in col.lower():
-                            current_values.append(col)
-                base_channel_dropdown['values'] = current_values
-                modifier_channel_dropdown['values'] = current_values
-                _last_shared_filter_text = new_text
-
-        shared_filter_entry.bind("<KeyRelease>", on_shared_filter_entry_change)
+        def on_shared_filter_entry_change(new_text):
+            current_values = ["None"] + self.data_handler.search_channels(new_text)
+            base_channel_dropdown['values'] = current_values
+            modifier_channel_dropdown['values'] = current_values
+
+        bind_search(shared_filter_entry, on_shared_filter_entry_change)
+
+        expression_row = tk.Frame(custom_channel_frame)
+        expression_row.pack(anchor='w', pady=(4, 4), padx=8, fill=tk.X)
+
+        expression_label = tk.Label(expression_row, text="Expr:")
+        expression_label.pack(side=tk.LEFT, padx=(0, 4))
+
+        expression_placeholder = "e.g. (a * 3600) / `b c` - d.shift(5)"
+        expression_var = tk.StringVar()
+        expression_entry = tk.Entry(expression_row, textvariable=expression_var)
+        set_entry_placeholder(expression_entry, expression_placeholder)
+        expression_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
         bottom_row = tk.Frame(custom_channel_frame)
         bottom_row.pack(anchor='w', pady=(8, 4), padx=8, fill=tk.X)
@@ -382,54 +2378,43 @@ class SettingsManager:
         name_entry.pack(side=tk.LEFT, padx=(0, 8))
 
         def create_custom_channel():
-            base = base_channel_var.get()
-            modifier = modifier_channel_var.get()
-            operand = operand_var.get()
+            expression_text = expression_var.get().strip()
+            if expression_text == expression_placeholder:
+                expression_text = ""
             custom_name = name_var.get().strip()
             if custom_name == "Custom channel name...":
                 custom_name = ""
 
-            if (base in ("None", "Base channel...")) or (modifier in ("None", "Modifier channel...")):
-                print("Error", "Please select both a base and a modifier channel.")
-                return
-
-            base_data = self.data_handler.get_channel_data(base)
-            modifier_data = self.data_handler.get_channel_data(modifier)
-            if base_data is None or modifier_data is None:
-                print("Error", "Invalid channel selection.")
-                return
-
-            try:
-                if operand == "+":
-                    new_data = base_data + modifier_data
-                elif operand == "-":
-                    new_data = base_data - modifier_data
-                elif operand == "*":
-                    new_data = base_data * modifier_data
-                elif operand == "/":
-                    with np.errstate(divide='ignore', invalid='ignore'):
-                        new_data = base_data / modifier_data
-                else:
+            if not expression_text:
+                base = base_channel_var.get()
+                modifier = modifier_channel_var.get()
+                operand = operand_var.get()
+                if (base in ("None", "Base channel...")) or (modifier in ("None", "Modifier channel...")):
+                    print("Error", "Please select both a base and a modifier channel, or enter an expression.")
+                    return
+                if operand not in ("+", "-", "*", "/"):
                     print("Error", "Invalid operand.")
                     return
-            except Exception as e:
+                expression_text = f"`{base}` {operand} `{modifier}`"
+
+            try:
+                expression = ChannelExpression(expression_text, self.data_handler.available_channels)
+            except ValueError as e:
                 print("Error", f"Failed to create custom channel: {e}")
                 return
 
-            custom_names = [col for col in self.data_handler.df.columns if col.startswith("custom_")]
+            custom_names = [col for col in self.data_handler.available_channels if col.startswith("custom_")]
             n_custom = len(custom_names)
             if custom_name == "":
                 new_name = f"custom_{n_custom+1}"
             else:
                 new_name = custom_name
 
-            if new_name in self.data_handler.df.columns:
+            if self.data_handler.has_channel(new_name):
                 print("Error", f"Channel '{new_name}' already exists.")
                 return
 
-            new_data = pd.Series(new_data, index=self.data_handler.df.index)
-            self.data_handler.df[new_name] = new_data
-            self.data_handler.available_channels = sorted(self.data_handler.df.columns)
+            self.data_handler.add_virtual_channel(new_name, expression)
             self.data_handler.select_channels([new_name])
             update_callback()
             update_callback2()
@@ -447,17 +2432,301 @@ class SettingsManager:
     def get_highlight_configs(self):
         return self.highlight_configs
 
-class Plotter(tk.Tk):
-    def __init__(self, df: pd.DataFrame, title: str):
-        super().__init__()
-        #self.df = df
-        self.data_handler = DataHandler(df)
+class TimedFigure(Figure):
+    def draw(self, renderer):
+        with profiler.span("draw"):
+            super().draw(renderer)
+
+class PlotLayout:
+    # builds the grouped figure for a DataHandler; Plotter adds the Tk window and interaction on
+    # top of it, HeadlessPlot renders it straight to a file
+    legend_outside = False
+    level_of_detail = True
+    autoscale_visible = False
+
+    def _init_layout(self, data_handler: DataHandler, title: str) -> None:
+        self.data_handler = data_handler
         self.title_text = title
         self._axes = []
         self._fig = None
+        self._highlight_layers: list[HighlightLayer] = []
+        self._overlay: ClickOverlay | None = None
+        self._channel_lines = {}
+        self._line_positions = {}
+        self._pixel_indexes: dict[object, tuple[PixelIndex, list]] = {}
 
         self._custom_ylims = {}
 
+    def _highlight_rules(self) -> list[tuple[str, str, str, str]]:
+        # (channel, filter mode, value, color) for each highlight rule
+        return []
+
+    def _figure_open(self) -> bool:
+        return False
+
+    def _new_figure(self, n_groups: int) -> tuple[Figure, list]:
+        fig = TimedFigure(figsize=(8, 2.5 * n_groups))
+        axes = fig.subplots(n_groups, 1, sharex=True, sharey=False, squeeze=False)
+        return fig, list(axes[:, 0])
+
+    @profiler.timed("plot.layout")
+    def layout(self, group_titles=None) -> bool | None:
+        # returns whether the existing figure was reused, or None when nothing is selected
+        if not len(self.data_handler.groups):
+            return None
+
+        sorted_groups = self.data_handler.groups.group_lists()
+        group_channel_lists = [
+            [channel for channel in channel_names if channel in self.data_handler.available_channels]
+            for group_num, channel_names in sorted_groups
+        ]
+
+        n_groups = len(sorted_groups)
+        reuse = self._fig is not None and self._figure_open()
+        for layer in self._highlight_layers:
+            layer.remove()
+        self._highlight_layers = []
+        if reuse:
+            axes = self._layout_axes(group_channel_lists)
+        else:
+            fig, axes = self._new_figure(n_groups)
+            self._fig = fig
+            self._custom_ylims = {}
+            self._channel_lines = {}
+            self._line_positions = {}
+            for ax in axes:
+                self._connect_axis(ax)
+        fig = self._fig
+        self._axes = axes
+        self._pixel_indexes = {}
+        self.data_handler.load_channels(
+            [channel for channels in group_channel_lists for channel in channels]
+            + [rule[0] for rule in self._highlight_rules()]
+        )
+        highlight_spans = self.highlight_spans()
+
+        for ax_idx, (group_num, channel_names) in enumerate(sorted_groups):
+            ax = axes[ax_idx]
+            group_channels = group_channel_lists[ax_idx]
+            changed = self._sync_lines(ax, group_channels)
+
+            if isinstance(self.data_handler.get_index(), pd.DatetimeIndex):
+                ax.xaxis_date(self.data_handler.get_index().tz)
+            self.highlight(ax, highlight_spans)
+            ax.grid(True, which='both', linestyle='--', alpha=0.6)
+            if ax not in self._custom_ylims and group_channels and changed:
+                ylim = self.data_handler.group_ylim(group_channels)
+                if ylim is not None:
+                    ax.set_ylim(*ylim)
+
+            if group_titles is not None and isinstance(group_titles, list) and ax_idx < len(group_titles):
+                group_title = group_titles[ax_idx]
+                if not group_title:
+                    group_title = f"Group {group_num}"
+            else:
+                group_title = f"Group {group_num}"
+
+            ax.set_ylabel(group_title)
+            if self.legend_outside:
+                ax.legend(
+                    loc='upper left',
+                    bbox_to_anchor=(1.01, 1.0),
+                    borderaxespad=0.0,
+                    fontsize=8,
+                    frameon=True
+                )
+            else:
+                ax.legend(loc='upper left', fontsize=8)
+
+            ax.xaxis.set_tick_params(labelbottom=ax_idx == n_groups - 1)
+            ax.set_xlabel("Index" if ax_idx == n_groups - 1 else "")
+
+        fig.suptitle(self.title_text)
+        return reuse
+
+    def _connect_axis(self, ax):
+        ax.callbacks.connect('xlim_changed', self._update_lod)
+        ax.callbacks.connect('xlim_changed', self._invalidate_pixel_index)
+        ax.callbacks.connect('ylim_changed', self._invalidate_pixel_index)
+        ax.callbacks.connect('xlim_changed', self._autoscale_visible)
+
+    def _layout_axes(self, group_channel_lists: list[list[str]]) -> list:
+        # keep the on-screen axes whose channels overlap each group most, then add or drop the rest
+        fig = self._fig
+        current = {ax: {channel for line, channel in self._channel_lines.get(ax, [])} for ax in self._axes}
+        unused = list(self._axes)
+        assigned = [None] * len(group_channel_lists)
+        for i, channels in enumerate(group_channel_lists):
+            best = max(unused, key=lambda ax: len(current[ax] & set(channels)), default=None)
+            if best is not None and current[best] & set(channels):
+                assigned[i] = best
+                unused.remove(best)
+        for i in range(len(assigned)):
+            if assigned[i] is None and unused:
+                # a spare axes taken over by an unrelated group must not keep the old group's y-limits
+                assigned[i] = unused.pop(0)
+                self._custom_ylims.pop(assigned[i], None)
+                assigned[i].set_autoscaley_on(True)
+
+        for ax in unused:
+            for line, channel in self._channel_lines.pop(ax, []):
+                self._line_positions.pop(line, None)
+            self._custom_ylims.pop(ax, None)
+            self._overlay.forget(ax)
+            ax.remove()
+
+        gridspec = fig.add_gridspec(len(assigned), 1)
+        anchor = next((ax for ax in assigned if ax is not None), None)
+        for i, ax in enumerate(assigned):
+            if ax is None:
+                ax = assigned[i] = fig.add_subplot(gridspec[i], sharex=anchor)
+                anchor = anchor or ax
+                self._connect_axis(ax)
+            else:
+                ax.set_subplotspec(gridspec[i])
+        fig.set_size_inches(8, 2.5 * len(assigned), forward=True)
+        return assigned
+
+    def _sync_lines(self, ax, channels: list[str]) -> bool:
+        current = self._channel_lines.get(ax, [])
+        kept = []
+        for line, channel in current:
+            if channel in channels:
+                kept.append((line, channel))
+            else:
+                line.remove()
+                self._line_positions.pop(line, None)
+        self._channel_lines[ax] = kept
+        self._refresh_lines(ax)
+
+        kept_channels = {channel for line, channel in kept}
+        for channel in channels:
+            if channel not in kept_channels:
+                self._plot_line(ax, channel)
+        return {channel for line, channel in current} != set(channels)
+
+    def _refresh_lines(self, ax):
+        if self.level_of_detail:
+            self._update_lod(ax)
+            return
+        x = self.data_handler.get_x()
+        for line, channel in self._channel_lines.get(ax, []):
+            line.set_data(x, self.data_handler.get_channel_values(channel))
+            self._line_positions[line] = None
+
+    @profiler.timed("plot.line")
+    def _plot_line(self, ax, channel: str):
+        x = self.data_handler.get_x()
+        if not self.level_of_detail:
+            line, = ax.plot(x, self.data_handler.get_channel_values(channel), label=channel, linewidth=2)
+            positions = None
+        else:
+            positions, values = self.data_handler.get_decimated(channel, 0, len(x), 2 * int(ax.bbox.width))
+            line, = ax.plot(x[positions], values, label=channel, linewidth=2)
+        self._channel_lines.setdefault(ax, []).append((line, channel))
+        self._line_positions[line] = positions
+
+    @profiler.timed("plot.lod")
+    def _update_lod(self, ax):
+        lines = self._channel_lines.get(ax)
+        if not lines or not self.level_of_detail:
+            return
+
+        x = self.data_handler.get_x()
+        xmin, xmax = sorted(ax.get_xlim())
+        lo = max(np.searchsorted(x, xmin, side='left') - 1, 0)
+        hi = min(np.searchsorted(x, xmax, side='right') + 1, len(x))
+
+        for line, channel in lines:
+            positions, values = self.data_handler.get_decimated(channel, lo, hi, 2 * int(ax.bbox.width))
+            line.set_data(x[positions], values)
+            self._line_positions[line] = positions
+
+    def _autoscale_visible(self, ax):
+        if not self.autoscale_visible or ax in self._custom_ylims:
+            return
+        channels = [channel for line, channel in self._channel_lines.get(ax, [])]
+        if not channels:
+            return
+        xmin, xmax = sorted(ax.get_xlim())
+        ylim = self.data_handler.group_ylim(channels, self.data_handler.get_window(xmin, xmax))
+        if ylim is not None:
+            ax.set_ylim(*ylim)
+
+    def _invalidate_pixel_index(self, ax):
+        self._pixel_indexes.pop(ax, None)
+
+    @profiler.timed("highlight.spans")
+    def highlight_spans(self) -> list[tuple[str, np.ndarray, np.ndarray]]:
+        highlight_spans = []
+        for channel_name, mode, value, color in self._highlight_rules():
+            if channel_name in (None, "", "None"):
+                continue
+            if channel_name not in self.data_handler.available_channels:
+                continue
+
+            channel_data = self.data_handler.get_channel_data(channel_name)
+            if channel_data is None:
+                continue
+
+            mask = highlight_mask(channel_data.to_numpy(), mode, value)
+            if mask is None:
+                continue
+
+            spans = find_spans(mask)
+            highlight_spans.append((
+                COLORS[color],
+                self.data_handler.get_x()[spans[:, 0]],
+                self.data_handler.get_x()[spans[:, 1]],
+            ))
+        return highlight_spans
+
+    def highlight(self, ax, highlight_spans=None):
+        if highlight_spans is None:
+            highlight_spans = self.highlight_spans()
+
+        for color, x0, x1 in highlight_spans:
+            self._highlight_layers.append(HighlightLayer(ax, x0, x1, color))
+
+    def _on_resize(self, event):
+        for layer in self._highlight_layers:
+            layer.update()
+        for ax in self._channel_lines:
+            self._update_lod(ax)
+        self._pixel_indexes = {}
+
+class HeadlessPlot(PlotLayout):
+    # the same layout, autoscaling and highlights as Plotter.plot, drawn without a window
+    def __init__(self, data_handler: DataHandler, title: str, highlights=(), legend_outside: bool = False, level_of_detail: bool = True):
+        self._init_layout(data_handler, title)
+        self.highlights = list(highlights)
+        self.legend_outside = legend_outside
+        self.level_of_detail = level_of_detail
+
+    def _highlight_rules(self) -> list[tuple[str, str, str, str]]:
+        return self.highlights
+
+    def render(self, path: str, group_titles=None, dpi: float | None = None) -> None:
+        if self.layout(group_titles) is None:
+            raise ValueError("No channels are selected to render.")
+        self._fig.tight_layout()
+        # tight_layout resizes the axes, so re-fit decimation and highlights as a window resize would
+        self._on_resize(None)
+        self._fig.savefig(path, dpi=dpi)
+
+class Plotter(PlotLayout, tk.Tk):
+    monitor: LatencyMonitor | None = None
+
+    def __init__(self, df: pd.DataFrame | DataHandler, title: str, storage: str = "frame", float32: bool = False):
+        super().__init__()
+        self.monitor = LatencyMonitor(self, profiler)
+        if profiler.enabled:
+            self.monitor.start()
+        #self.df = df
+        if not isinstance(df, DataHandler):
+            df = DataHandler(df, storage=storage, float32=float32)
+        self._init_layout(df, title)
+
         self.title(title)
         self.geometry("1050x400")
 
@@ -472,29 +2741,23 @@ class Plotter(tk.Tk):
         set_entry_placeholder(self.filter_entry, "Search channels...")
         self.filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
 
-        self._last_filter_text = ""
-        def on_filter_entry_change(event):
-            new_text = self.filter_entry.get()
-
-            if new_text != self._last_filter_text:
-                self.listbox.delete(0, tk.END)
+        self._filter_text = ""
+        def on_filter_entry_change(new_text):
+            self._filter_text = new_text
+            self.update_available_listbox()
 
-                for col in self.data_handler.available_channels:
-                    if new_text.lower() in col.lower():
-                        self.listbox.insert(tk.END, col)
-                self._last_filter_text = new_text
-            else:
-                pass
-
-        self.filter_entry.bind("<KeyRelease>", on_filter_entry_change)
+        bind_search(self.filter_entry, on_filter_entry_change)
 
         list_label = tk.Label(filter_label_frame, text="Available Channels")
         list_label.pack(side=tk.RIGHT, anchor='e')
 
-        self.listbox = tk.Listbox(left_frame, selectmode=tk.EXTENDED, activestyle='none')
-        self.listbox.pack(fill=tk.BOTH, expand=True)
+        available_scrollbar = tk.Scrollbar(left_frame, orient=tk.VERTICAL)
+        available_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox = VirtualListbox(left_frame)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.listbox.attach_scrollbar(available_scrollbar)
         
-        self.listbox.insert(tk.END, *sorted(self.data_handler.available_channels))
+        self.listbox.set_rows(self.data_handler.search_channels(""))
 
         right_frame = tk.Frame(self, width=300)
         right_frame.pack(side=tk.LEFT, fill=tk.Y, padx=10, pady=10, anchor='n')
@@ -503,8 +2766,14 @@ class Plotter(tk.Tk):
         selected_label = tk.Label(right_frame, text="Selected Channels")
         selected_label.pack(anchor='w')
 
-        self.selected_listbox = tk.Listbox(right_frame, selectmode=tk.EXTENDED, activestyle='none')
-        self.selected_listbox.pack(fill=tk.BOTH, expand=True)
+        selected_list_frame = tk.Frame(right_frame)
+        selected_list_frame.pack(fill=tk.BOTH, expand=True)
+        selected_scrollbar = tk.Scrollbar(selected_list_frame, orient=tk.VERTICAL)
+        selected_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.selected_listbox = VirtualListbox(selected_list_frame, format_row=lambda row: f"{row[0]} [{row[1]}]")
+        self.selected_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.selected_listbox.attach_scrollbar(selected_scrollbar)
+        self.selected_listbox.set_rows(self.data_handler.groups)
 
         middle_frame = tk.Frame(self)
         middle_frame.pack(side=tk.LEFT, fill=tk.Y, pady=10, before=right_frame)
@@ -559,76 +2828,90 @@ class Plotter(tk.Tk):
         )
         legend_label.pack(side=tk.TOP, anchor='center', fill=tk.X, expand=True)
 
+        lod_frame = tk.Frame(plot_btn_frame)
+        lod_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 2))
+
+        self.lod_var = tk.BooleanVar(value=True)
+        self.level_of_detail = True
+
+        def update_level_of_detail(*args):
+            self.level_of_detail = self.lod_var.get()
+        self.lod_var.trace_add('write', update_level_of_detail)
+
+        lod_checkbox = tk.Checkbutton(
+            lod_frame, variable=self.lod_var, width=3, padx=0, pady=0
+        )
+        lod_checkbox.pack(side=tk.BOTTOM, anchor='center', fill=tk.X, expand=True, pady=(0,0))
+
+        lod_label = tk.Label(
+            lod_frame, text="Fast\nrender", justify='center', font=("", 8)
+        )
+        lod_label.pack(side=tk.TOP, anchor='center', fill=tk.X, expand=True)
+
+        autoscale_frame = tk.Frame(plot_btn_frame)
+        autoscale_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 2))
+
+        self.autoscale_visible_var = tk.BooleanVar(value=False)
+        self.autoscale_visible = False
+
+        def update_autoscale_visible(*args):
+            self.autoscale_visible = self.autoscale_visible_var.get()
+        self.autoscale_visible_var.trace_add('write', update_autoscale_visible)
+
+        autoscale_checkbox = tk.Checkbutton(
+            autoscale_frame, variable=self.autoscale_visible_var, width=3, padx=0, pady=0
+        )
+        autoscale_checkbox.pack(side=tk.BOTTOM, anchor='center', fill=tk.X, expand=True, pady=(0,0))
+
+        autoscale_label = tk.Label(
+            autoscale_frame, text="Zoom\nY-fit", justify='center', font=("", 8)
+        )
+        autoscale_label.pack(side=tk.TOP, anchor='center', fill=tk.X, expand=True)
+
         plot_btn = tk.Button(plot_btn_frame, text="Plot", command=self.plot, height=2)
         plot_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(2,0))
-    
-    def plot(self, group_titles=None):
-        if not self.data_handler.selected_channels:
-            return
 
-        groups = {}
-        for channel_dict in self.data_handler.selected_channels:
-            channel_name = list(channel_dict.keys())[0]
-            group_num = channel_dict[channel_name]
-            if group_num not in groups:
-                groups[group_num] = []
-            groups[group_num].append(channel_name)
+        self._profile_panel: ProfilePanel | None = None
+        self.bind("<F12>", lambda event: self.show_profile())
 
-        sorted_groups = sorted(groups.items(), key=lambda x: x[0])
+        self._stream_after = None
+        self._stream_failures = 0
+        if isinstance(self.data_handler, StreamingDataHandler):
+            self._stream_after = self.after(STREAM_REFRESH_MS, self._stream_tick)
+    
+    def _highlight_rules(self) -> list[tuple[str, str, str, str]]:
+        return [
+            (config['highlight_channel_var'].get(), config['filter_mode_var'].get(), config['value_var'].get(), config['color_var'].get())
+            for config in self.hc.get_highlight_configs()
+        ]
 
-        n_groups = len(sorted_groups)
-        fig, axes = plt.subplots(n_groups, 1, sharex=True, sharey=False, figsize=(8, 2.5 * n_groups))
+    def _figure_open(self) -> bool:
+        return plt.fignum_exists(self._fig.number)
+
+    def _new_figure(self, n_groups: int) -> tuple[Figure, list]:
+        fig, axes = plt.subplots(n_groups, 1, sharex=True, sharey=False, figsize=(8, 2.5 * n_groups), FigureClass=TimedFigure)
         if n_groups == 1:
             axes = [axes]
         else:
             axes = list(axes)
-        self._axes = axes
-        self._fig = fig
-
-        for ax_idx, (group_num, channel_names) in enumerate(sorted_groups):
-            ax = axes[ax_idx]
-            group_data = []
-            for channel in channel_names:
-                if channel not in self.data_handler.available_channels:
-                    continue
-                data = self.data_handler.get_channel_data(channel)
-                ax.plot(self.data_handler.get_index(), data, label=channel, linewidth=2)
-                group_data.append(data)
-
-            ax.grid(True, which='both', linestyle='--', alpha=0.6)
-            if ax not in self._custom_ylims and group_data:
-                all_data = pd.concat(group_data)
-                q_low = all_data.quantile(0.01)
-                q_high = all_data.quantile(0.99)
-                space = 0.1 * (q_high - q_low)
-                if space == 0:
-                    space = 0.1 * abs(q_high) if q_high != 0 else 1.0
-                ymin = q_low - space
-                ymax = q_high + space
-                ax.set_ylim(ymin, ymax)
+        self._overlay = ClickOverlay(fig)
+        if self.monitor is not None:
+            self.monitor.watch_canvas(fig.canvas)
+        return fig, axes
 
-            if group_titles is not None and isinstance(group_titles, list) and ax_idx < len(group_titles):
-                group_title = group_titles[ax_idx]
-                if not group_title:
-                    group_title = f"Group {group_num}"
-            else:
-                group_title = f"Group {group_num}"
-
-            ax.set_ylabel(group_title)
-            if self.legend_outside:
-                ax.legend(
-                    loc='upper left',
-                    bbox_to_anchor=(1.01, 1.0),
-                    borderaxespad=0.0,
-                    fontsize=8,
-                    frameon=True
-                )
-            else:
-                ax.legend(loc='upper left', fontsize=8)
+    def plot(self, group_titles=None):
+        reuse = self.layout(group_titles)
+        if reuse is None:
+            return
+        fig = self._fig
+        if reuse:
+            fig.tight_layout()
+            fig.canvas.draw_idle()
+            return
 
-        axes[-1].set_xlabel("Index")
-        fig.suptitle(self.title_text)
         fig.canvas.mpl_connect('button_press_event', self._on_click)
+        fig.canvas.mpl_connect('resize_event', self._on_resize)
+        fig.canvas.mpl_connect('key_press_event', self._on_key)
 
         if hasattr(fig.canvas, "toolbar") and fig.canvas.toolbar is not None:
             toolbar = fig.canvas.toolbar
@@ -658,140 +2941,115 @@ class Plotter(tk.Tk):
             self._fig.canvas.draw_idle()
         plt.show()
 
-    def highlight(self, ax):
-        highlight_configs = self.hc.get_highlight_configs()
-        
-        for config in highlight_configs:
-            highlight_channel_var = config['highlight_channel_var']
-            filter_mode_var = config['filter_mode_var']
-            value_var = config['value_var']
-            color_var = config['color_var']
-            
-            if highlight_channel_var.get() in (None, "", "None"):
-                continue
-                
-            channel_name = highlight_channel_var.get()
-            if channel_name not in self.data_handler.available_channels:
-                continue
-                
-            channel_data = self.data_handler.get_channel_data(channel_name)
-
-            if channel_data is None:
-                continue
-            
-            filter_modes = ["==", ">=", "<=", ">", "<", "isin"]
-            if filter_mode_var.get() not in filter_modes:
-                continue
-                
-            if value_var.get() in (None, ""):
-                continue
+    @profiler.timed("click.index")
+    def _build_pixel_index(self, ax) -> tuple[PixelIndex, list]:
+        lines = self._channel_lines.get(ax, [])
+        points, owners, positions = [], [], []
+        for i, (line, channel) in enumerate(lines):
+            line_positions = self._line_positions.get(line)
+            if line_positions is None:
+                line_positions = np.arange(len(self.data_handler.get_x()))
+            points.append(line.get_xydata())
+            owners.append(np.full(len(line_positions), i))
+            positions.append(line_positions)
+        if not points:
+            return PixelIndex(np.empty((0, 2)), np.empty(0, dtype=int), np.empty(0, dtype=int)), lines
+        points = ax.transData.transform(np.concatenate(points))
+        return PixelIndex(points, np.concatenate(owners), np.concatenate(positions)), lines
+
+    @profiler.timed("click.lookup")
+    def _nearest_point(self, ax, x_click: float, y_click: float) -> tuple[object, str, int] | None:
+        if ax not in self._pixel_indexes:
+            self._pixel_indexes[ax] = self._build_pixel_index(ax)
+        pixel_index, lines = self._pixel_indexes[ax]
+        hit = pixel_index.query(x_click, y_click)
+        if hit is None:
+            return None
+        owner, pos, _ = hit
+        line, channel = lines[owner]
+
+        # decimated lines skip samples between bucket extremes, so settle on the raw sample near the click
+        x = self.data_handler.get_x()
+        inverse = ax.transData.inverted()
+        x_lo = inverse.transform((x_click - 3, y_click))[0]
+        x_hi = inverse.transform((x_click + 3, y_click))[0]
+        window = self.data_handler.get_window(min(x_lo, x_hi), max(x_lo, x_hi))
+        lo, hi = window.start, window.stop
+        if 0 < hi - lo <= 4096:
+            values = self.data_handler.get_channel_values(channel)
+            raw = ax.transData.transform(np.column_stack((x[lo:hi], values[lo:hi])))
+            distances = np.hypot(raw[:, 0] - x_click, raw[:, 1] - y_click)
+            if np.isfinite(distances).any():
+                nearest = int(np.nanargmin(distances))
+                if distances[nearest] < hit[2]:
+                    pos = lo + nearest
+        return line, channel, pos
+
+    @profiler.timed("stream.tick")
+    def _stream_tick(self):
+        # publish rows streamed in since the last tick; a view that showed the newest sample keeps following it
+        try:
+            x = self.data_handler.get_x()
+            last_x = x[-1] if len(x) else None
+            if self.data_handler.sync() and self._fig is not None and plt.fignum_exists(self._fig.number) and self._axes:
+                x = self.data_handler.get_x()
+                ax = self._axes[0]
+                xmin, xmax = ax.get_xlim()
+                following = last_x is None or xmax >= last_x
+                if last_x is None:
+                    ax.set_xlim(x[0], x[-1])
+                    for group_ax, lines in self._channel_lines.items():
+                        ylim = self.data_handler.group_ylim([channel for line, channel in lines])
+                        if group_ax not in self._custom_ylims and ylim is not None:
+                            group_ax.set_ylim(*ylim)
+                elif following:
+                    ax.set_xlim(xmin + x[-1] - last_x, x[-1] + (xmax - last_x))
+                if not following or not self.level_of_detail:
+                    for group_ax in self._channel_lines:
+                        self._refresh_lines(group_ax)
+                self._pixel_indexes = {}
+                self._fig.canvas.draw_idle()
+        except Exception as e:
+            # report the first failure of a run and keep following, until too many in a row
+            self._stream_failures += 1
+            if self._stream_failures == 1:
+                print("Error", f"Live update failed: {e}")
+            if self._stream_failures >= STREAM_MAX_FAILURES:
+                print("Error", f"Live updates stopped after {self._stream_failures} failures in a row: {e}")
+                self._stream_after = None
+                return
+        else:
+            self._stream_failures = 0
+        self._stream_after = self.after(STREAM_REFRESH_MS, self._stream_tick)
 
-            fm = filter_mode_var.get()
-            color = COLORS[color_var.get()]
-
-            match fm:
-                case "==":
-                    try:
-                        val = float(value_var.get())
-                    except ValueError:
-                        continue
-                    highlighting = False
-                    start = None
-                    for i, v in enumerate(channel_data):
-                        if v == val and not highlighting:
-                            highlighting = True
-                            start = self.data_handler.index[i]
-                        elif v != val and highlighting:
-                            highlighting = False
-                            ax.axvspan(start, self.data_handler.index[i-1], color=color, alpha=0.5)
-                    if highlighting and start is not None:
-                        ax.axvspan(start, self.data_handler.index[-1], color=color, alpha=0.5)
-                case ">=": 
-                    try:
-                        val = float(value_var.get())
-                    except ValueError:
-                        continue
-                    highlighting = False
-                    start = None
-                    for i, v in enumerate(channel_data):
-                        if v >= val and not highlighting:
-                            highlighting = True
-                            start = self.data_handler.index[i]
-                        elif v < val and highlighting:
-                            highlighting = False
-                            ax.axvspan(start, self.data_handler.index[i-1], color=color, alpha=0.5)
-                    if highlighting and start is not None:
-                        ax.axvspan(start, self.data_handler.index[-1], color=color, alpha=0.5)
-                case "<=":
-                    try:
-                        val = float(value_var.get())
-                    except ValueError:
-                        continue
-                    highlighting = False
-                    start = None
-                    for i, v in enumerate(channel_data):
-                        if v <= val and not highlighting:
-                            highlighting = True
-                            start = self.data_handler.index[i]
-                        elif v > val and highlighting:
-                            highlighting = False
-                            ax.axvspan(start, self.data_handler.index[i-1], color=color, alpha=0.5)
-                    if highlighting and start is not None:
-                        ax.axvspan(start, self.data_handler.index[-1], color=color, alpha=0.5)
-                case ">":
-                    try:
-                        val = float(value_var.get())
-                    except ValueError:
-                        continue
-                    highlighting = False
-                    start = None
-                    for i, v in enumerate(channel_data):
-                        if v > val and not highlighting:
-                            highlighting = True
-                            start = self.data_handler.index[i]
-                        elif v <= val and highlighting:
-                            highlighting = False
-                            ax.axvspan(start, self.data_handler.index[i-1], color=color, alpha=0.5)
-                    if highlighting and start is not None:
-                        ax.axvspan(start, self.data_handler.index[-1], color=color, alpha=0.5)
-                case "<":
-                    try:
-                        val = float(value_var.get())
-                    except ValueError:
-                        continue
-                    highlighting = False
-                    start = None
-                    for i, v in enumerate(channel_data):
-                        if v < val and not highlighting:
-                            highlighting = True
-                            start = self.data_handler.index[i]
-                        elif v >= val and highlighting:
-                            highlighting = False
-                            ax.axvspan(start, self.data_handler.index[i-1], color=color, alpha=0.5)
-                    if highlighting and start is not None:
-                        ax.axvspan(start, self.data_handler.index[-1], color=color, alpha=0.5)
-                case "isin":
-                    val_str = value_var.get()
-                    vals = [s.strip() for s in val_str.split(",")]
-                    for val in vals:
-                        try:
-                            val_float = float(val)
-                        except ValueError:
-                            continue
-                        highlighting = False
-                        start = None
-                        for i, v in enumerate(channel_data):
-                            if v == val_float and not highlighting:
-                                highlighting = True
-                                start = self.data_handler.index[i]
-                            elif v != val_float and highlighting:
-                                highlighting = False
-                                ax.axvspan(start, self.data_handler.index[i-1], color=color, alpha=0.5)
-                        if highlighting and start is not None:
-                            ax.axvspan(start, self.data_handler.index[-1], color=color, alpha=0.5)
+    def show_profile(self):
+        if self._profile_panel is not None and self._profile_panel.winfo_exists():
+            self._profile_panel.lift()
+        else:
+            self._profile_panel = ProfilePanel(self, profiler, self.monitor)
+
+    def destroy(self):
+        if self._stream_after is not None:
+            self.after_cancel(self._stream_after)
+            self._stream_after = None
+        if self.monitor is not None:
+            self.monitor.stop()
+        super().destroy()
+
+    def _on_key(self, event):
+        # ctrl+z undoes the last click's markers, delete clears them all, F12 opens the profile panel
+        if event.key == 'f12':
+            self.show_profile()
+            return
+        if self._overlay is None:
+            return
+        if event.key == 'ctrl+z':
+            self._overlay.refresh(self._overlay.undo())
+        elif event.key == 'delete':
+            self._overlay.refresh(self._overlay.clear())
 
+    @profiler.timed("click")
     def _on_click(self, event):
-        start = int(time.time() * 1000)
         if getattr(getattr(event.canvas, "toolbar", None), "mode", None):
             return
         if not getattr(self, '_axes', None):
@@ -850,134 +3108,45 @@ class Plotter(tk.Tk):
         if not lines:
             return
 
-        saved_xlims = [ax.get_xlim() for ax in self._axes]
-        saved_ylims = [ax.get_ylim() for ax in self._axes]
-
         idx = self.data_handler.index
+        x = self.data_handler.get_x()
         x_click, y_click = event.x, event.y
-        xlim = clicked_ax.get_xlim()
-
-        if isinstance(idx, pd.DatetimeIndex):
-            lowlim = mdates.num2date(xlim[0])
-            highlim = mdates.num2date(xlim[1])
-            if lowlim.tzinfo is not None:
-                lowlim = lowlim.replace(tzinfo=None)
-            if highlim.tzinfo is not None:
-                highlim = highlim.replace(tzinfo=None)
-            visible_mask = (idx >= lowlim) & (idx <= highlim)
-        else:
-            lowlim, highlim = xlim[0], xlim[1]
-            visible_mask = (idx >= lowlim) & (idx <= highlim)
+        xmin, xmax = sorted(clicked_ax.get_xlim())
 
-        visible_idx = idx[visible_mask]
-        if len(visible_idx) == 0:
+        window = self.data_handler.get_window(xmin, xmax)
+        if window.stop <= window.start:
             return
 
-        max_points = 10000
-        if len(visible_idx) > max_points:
-            step = len(visible_idx) // max_points
-            visible_idx = visible_idx[::step]
-            visible_mask = visible_mask[::step]
-
-        if isinstance(idx, pd.DatetimeIndex):
-            visible_xdata = mdates.date2num(visible_idx)
-        else:
-            visible_xdata = np.asarray(visible_idx)
-
         if event.button == 1:
-            y_center = 0.5 * (clicked_ax.get_ylim()[0] + clicked_ax.get_ylim()[1])
-            x_disp_all = clicked_ax.transData.transform(np.column_stack([visible_xdata, np.full_like(visible_xdata, y_center)]))[:, 0]
-            
-            min_dist = float('inf')
-            closest_info = None
-            
-            for line in lines:
-                label = line.get_label()
-                if label not in self.data_handler.df.columns:
-                    continue
-
-                visible_data = self.data_handler.df.loc[visible_idx, label].values
-                
-                y_disp_all = clicked_ax.transData.transform(np.column_stack([visible_xdata, visible_data]))[:, 1]
-                distances = np.hypot(x_disp_all - x_click, y_disp_all - y_click)
-                
-                min_idx = np.argmin(distances)
-                min_dist_line = distances[min_idx]
-                
-                if min_dist_line < 5:
-                    closest_info = (line, visible_xdata[min_idx], visible_data[min_idx], visible_idx[min_idx], label)
-                    break
-                
-                if min_dist_line < min_dist:
-                    min_dist = min_dist_line
-                    closest_info = (line, visible_xdata[min_idx], visible_data[min_idx], visible_idx[min_idx], label)
-            
-            if closest_info:
-                end = int(time.time() * 1000)
-                line, x_val, y_val, idx_val, col_name = closest_info
-                print(f"\n({end-start}) Left click closest point: {idx_val}\nData: {col_name}: {y_val}")
-                
-                clicked_ax.plot(x_val, y_val, marker='o', markersize=4,
-                                markerfacecolor=line.get_color(), markeredgecolor='black',
-                                markeredgewidth=1, linestyle='None', zorder=5, label='_nolegend_')
-                clicked_ax.annotate(
-                    f"{col_name}: {y_val:.2f}",
-                    xy=(x_val, y_val),
-                    xytext=(0, 10),
-                    textcoords='offset points',
-                    ha='center',
-                    va='bottom',
-                    color='black',
-                    fontsize=8
-                )
+            closest = self._nearest_point(clicked_ax, x_click, y_click)
+            if closest:
+                line, col_name, pos = closest
+                x_val = x[pos]
+                y_val = self.data_handler.get_channel_values(col_name)[pos]
+                idx_val = idx[pos]
+                print(f"\nLeft click closest point: {idx_val}\nData: {col_name}: {y_val}")
+                axes = self._overlay.add_click([(clicked_ax, x_val, y_val, line.get_color(), f"{col_name}: {y_val:.2f}")])
+                self._overlay.refresh(axes)
 
         elif event.button == 3:
-            y_center = 0.5 * (clicked_ax.get_ylim()[0] + clicked_ax.get_ylim()[1])
-            x_disp_all = clicked_ax.transData.transform(np.column_stack([visible_xdata, np.full_like(visible_xdata, y_center)]))[:, 0]
-            
-            closest_idx = np.argmin(np.abs(x_disp_all - x_click))
-            closest_time = visible_idx[closest_idx]
-            
-            data_at_time = self.data_handler.df.loc[closest_time]
+            closest_pos = min(np.searchsorted(x, event.xdata), window.stop - 1)
+            closest_pos = max(closest_pos, window.start)
+            if closest_pos > window.start and event.xdata - x[closest_pos - 1] < x[closest_pos] - event.xdata:
+                closest_pos -= 1
+            closest_time = idx[closest_pos]
             
             print()
             print(f"Right click at time: {closest_time}")
             print("Data at this time (shown):")
-            
+
+            markers = []
             for ax in self._axes:
-                for line in ax.get_lines():
-                    if line.get_label() in self.data_handler.df.columns:
-                        column = line.get_label()
-                        value = data_at_time[column]
-                        print(f"{column}: {value}")
-                        
-                        if isinstance(idx, pd.DatetimeIndex):
-                            x_plot = float(mdates.date2num(closest_time))
-                        else:
-                            x_plot = float(np.asarray(closest_time))
-                        
-                        ax.plot(x_plot, value, marker='o', markersize=4,
-                                markerfacecolor=line.get_color(), markeredgecolor='black', markeredgewidth=1,
-                                linestyle='None', zorder=5, label='_nolegend_')
-                        ax.annotate(
-                            f"{column}: {value:.2f}",
-                            xy=(x_plot, value),
-                            xytext=(0, 10),
-                            textcoords='offset points',
-                            ha='center',
-                            va='bottom',
-                            color='black',
-                            fontsize=8
-                        )
-            
-            print(f"({int(time.time() * 1000)-start})")
-        
-        for i, ax in enumerate(self._axes):
-            ax.set_xlim(saved_xlims[i])
-            ax.set_ylim(saved_ylims[i])
-        
-        if self._fig is not None:
-            self._fig.canvas.draw_idle()
+                for line, column in self._channel_lines.get(ax, []):
+                    value = self.data_handler.get_channel_values(column)[closest_pos]
+                    print(f"{column}: {value}")
+                    markers.append((ax, x[closest_pos], value, line.get_color(), f"{column}: {value:.2f}"))
+
+            self._overlay.refresh(self._overlay.add_click(markers))
 
     def buttonClick(self, index):
         match index:
@@ -1012,10 +3181,7 @@ class Plotter(tk.Tk):
                 if not selected_indices:
                     return
                 
-                channels = []
-                for i in selected_indices:
-                    channel_name = list(self.data_handler.selected_channels[i].keys())[0]
-                    channels.append(channel_name)
+                channels = self.data_handler.groups.names_at(selected_indices)
                 
                 self.data_handler.split_channels(channels)
                 self.update_selected_listbox()
@@ -1025,10 +3191,7 @@ class Plotter(tk.Tk):
                 if not selected_indices:
                     return
                 
-                channels = []
-                for i in selected_indices:
-                    channel_name = list(self.data_handler.selected_channels[i].keys())[0]
-                    channels.append(channel_name)
+                channels = self.data_handler.groups.names_at(selected_indices)
                 
                 self.data_handler.combine_channels(channels)
                 self.update_selected_listbox()
@@ -1038,10 +3201,7 @@ class Plotter(tk.Tk):
                 if not selected_indices:
                     return
                 
-                channels = []
-                for i in selected_indices:
-                    channel_name = list(self.data_handler.selected_channels[i].keys())[0]
-                    channels.append(channel_name)
+                channels = self.data_handler.groups.names_at(selected_indices)
                 
                 self.data_handler.move(channels, "up")
                 self.update_selected_listbox()
@@ -1051,10 +3211,7 @@ class Plotter(tk.Tk):
                 if not selected_indices:
                     return
                 
-                channels = []
-                for i in selected_indices:
-                    channel_name = list(self.data_handler.selected_channels[i].keys())[0]
-                    channels.append(channel_name)
+                channels = self.data_handler.groups.names_at(selected_indices)
                 
                 self.data_handler.move(channels, "down")
                 self.update_selected_listbox()
@@ -1062,10 +3219,7 @@ class Plotter(tk.Tk):
             case 8:  # "<"
                 selected_indices = [i for i in self.selected_listbox.curselection()]
                 if selected_indices:
-                    channels = []
-                    for i in selected_indices:
-                        channel_name = list(self.data_handler.selected_channels[i].keys())[0]
-                        channels.append(channel_name)
+                    channels = self.data_handler.groups.names_at(selected_indices)
                     
                     self.data_handler.remove_channels(channels)
                     self.update_selected_listbox()
@@ -1078,34 +3232,79 @@ class Plotter(tk.Tk):
                 print(f"Unknown button index: {index}")
 
     def update_selected_listbox(self):
-        self.selected_listbox.delete(0, tk.END)
-        for channel_dict in self.data_handler.selected_channels:
-            channel_name = list(channel_dict.keys())[0]
-            group = channel_dict[channel_name]
-            self.selected_listbox.insert(tk.END, f"{channel_name} [{group}]")
+        self.selected_listbox.set_rows(self.data_handler.groups)
 
     def update_available_listbox(self):
-        self.listbox.delete(0, tk.END)
-        for channel_name in self.data_handler.available_channels:
-            self.listbox.insert(tk.END, f"{channel_name}")
+        self.listbox.set_rows(self.data_handler.search_channels(self._filter_text))
 
-def plot_assist_df(df: pd.DataFrame, title: str, autoDict: dict[str, str] | None = None):
+def select_auto_dict(data_handler: DataHandler, autoDict: dict[str, str]) -> list[str]:
+    group_to_channels = {}
+    for channel_name, group in autoDict.items():
+        group_to_channels.setdefault(group, []).append(channel_name)
+    for group, channels in group_to_channels.items():
+        data_handler.select_channels(channels, keep_group=True)
+    return list(group_to_channels.keys())
+
+def plot_assist_df(df: pd.DataFrame | DataHandler, title: str, autoDict: dict[str, str] | None = None, storage: str = "frame", float32: bool = False):
     if autoDict:
-        app = Plotter(df, title)
-        group_to_channels = {}
-        for channel_name, group in autoDict.items():
-            group_to_channels.setdefault(group, []).append(channel_name)
-        for group, channels in group_to_channels.items():
-            app.data_handler.select_channels(channels, keep_group=True)
-        group_names = list(group_to_channels.keys())
+        app = Plotter(df, title, storage=storage, float32=float32)
+        group_names = select_auto_dict(app.data_handler, autoDict)
         app.plot(group_names)
     else:
-        app = Plotter(df, title)
+        app = Plotter(df, title, storage=storage, float32=float32)
         app.mainloop()
 
+def plot_assist_file(path: str, title: str, autoDict: dict[str, str] | None = None, memory_budget: int = 512 * 2**20, float32: bool = False, cache: bool = True):
+    plot_assist_df(LazyDataHandler(path, memory_budget=memory_budget, float32=float32, cache=cache), title, autoDict)
+
+def plot_assist_follow(path: str, title: str, autoDict: dict[str, str] | None = None, capacity: int = STREAM_CAPACITY):
+    plot_assist_df(FollowDataHandler(path, capacity=capacity), title, autoDict)
+
+BATCH_FORMATS = ("png", "pdf", "svg")
+BATCH_TASKS_PER_CHILD = 8
+
+def render_auto_dict(source: str | pd.DataFrame, path: str, title: str, autoDict: dict[str, str], highlights=(), legend_outside: bool = False, memory_budget: int = 512 * 2**20, float32: bool = False, cache: bool = False) -> str:
+    if isinstance(source, str):
+        data_handler = LazyDataHandler(source, memory_budget=memory_budget, float32=float32, cache=cache)
+    else:
+        # one packed block per worker, downcast to float32 where within 1e-6 of the range when asked
+        data_handler = DataHandler(source, storage="block", float32=float32)
+    plot = HeadlessPlot(data_handler, title, highlights, legend_outside)
+    plot.render(path, select_auto_dict(data_handler, autoDict))
+    return path
+
+def plot_assist_batch(sources: list[str | pd.DataFrame], autoDict: dict[str, str], out_dir: str, fmt: str = "png", highlights=(), legend_outside: bool = False, processes: int | None = None, memory_budget: int = 512 * 2**20, float32: bool = False, cache: bool = False) -> list[str | None]:
+    # renders one figure per source into out_dir, named after the file (or plot_<n> for DataFrames);
+    # highlights are (channel, filter mode, value, color) rules. Files are read lazily under
+    # memory_budget and workers are recycled every BATCH_TASKS_PER_CHILD renders, which bounds the
+    # memory of each worker. No column cache is written next to the inputs unless cache is set.
+    # A source that fails is reported and gets None in the result.
+    if fmt not in BATCH_FORMATS:
+        raise ValueError(f"fmt must be one of {BATCH_FORMATS}.")
+    names = [
+        os.path.splitext(os.path.basename(source))[0] if isinstance(source, str) else f"plot_{i}"
+        for i, source in enumerate(sources)
+    ]
+    if len(set(names)) != len(names):
+        raise ValueError("Batch sources must have distinct file names.")
+    os.makedirs(out_dir, exist_ok=True)
+
+    # spawned workers never inherit the caller's Tk or pyplot state
+    with multiprocessing.get_context("spawn").Pool(processes, maxtasksperchild=BATCH_TASKS_PER_CHILD) as pool:
+        jobs = [
+            pool.apply_async(render_auto_dict, (source, os.path.join(out_dir, f"{name}.{fmt}"), name, autoDict, highlights, legend_outside, memory_budget, float32, cache))
+            for source, name in zip(sources, names)
+        ]
+        paths = []
+        for name, job in zip(names, jobs):
+            try:
+                paths.append(job.get())
+            except Exception as e:
+                print("Error", f"Could not render '{name}': {e}")
+                paths.append(None)
+    return paths
+
 if __name__ == "__main__":
     # exmaple autodict:
     # {"cosine": "grouped", "sine": "grouped", "linear": "not grouped"}
-    df = pd.read_csv('example_dataframe_time.csv', index_col=0)
-    df.index = pd.to_datetime(df.index)
-    plot_assist_df(df, "Plot Assist")
\ No newline at end of file
+    plot_assist_file('example_dataframe_time.csv', "Plot Assist")
\ No newline at end of file